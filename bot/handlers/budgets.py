@@ -7,8 +7,7 @@ from datetime import date, datetime, timezone
 from decimal import Decimal
 from typing import List
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes, ConversationHandler
 
@@ -25,7 +24,7 @@ from bot.keyboards import (
 )
 from bot.utils.amounts import format_currency, parse_amount
 from database import SessionLocal
-from models import Budget, Category, CategoryType, Transaction
+from models import Budget, BudgetStatus, Category, CategoryType
 
 logger = get_logger("handlers.budgets")
 
@@ -251,19 +250,11 @@ async def view_budgets(
     if not telegram_user or not chat:
         return
 
-    now = get_now_utc()
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    if month_start.month == 12:
-        next_month = month_start.replace(year=month_start.year + 1, month=1)
-    else:
-        next_month = month_start.replace(month=month_start.month + 1)
-
     with SessionLocal() as session:
+        # Una sola consulta: la vista ya trae lo gastado en el mes actual.
         budgets = list(
             session.execute(
-                select(Budget)
-                .where(Budget.user_id == telegram_user.id)
-                .options(joinedload(Budget.category))
+                select(BudgetStatus).where(BudgetStatus.user_id == telegram_user.id)
             ).scalars()
         )
 
@@ -300,35 +291,10 @@ async def view_budgets(
 
         lines: List[str] = []
         for budget in budgets:
-            category_name = budget.category.name if budget.category else "Categoría"
-            spent_value = session.execute(
-                select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                    Transaction.user_id == telegram_user.id,
-                    Transaction.category_id == budget.category_id,
-                    Transaction.transaction_date >= month_start,
-                    Transaction.transaction_date < next_month,
-                )
-            ).scalar()
-
-            if spent_value is None:
-                spent = Decimal("0")
-            elif isinstance(spent_value, Decimal):
-                spent = spent_value
-            else:
-                spent = Decimal(spent_value)
-
-            budget_amount_value = budget.amount or Decimal("0")
-            budget_amount = (
-                budget_amount_value
-                if isinstance(budget_amount_value, Decimal)
-                else Decimal(budget_amount_value)
-            )
-            if budget_amount <= 0:
-                percentage = Decimal("0")
-            else:
-                percentage = (
-                    spent / budget_amount * Decimal("100")
-                ).quantize(Decimal("0.01"))
+            category_name = budget.category_name or "Categoría"
+            spent = budget.spent or Decimal("0")
+            budget_amount = budget.amount or Decimal("0")
+            percentage = budget.pct_used if budget_amount > 0 else Decimal("0")
 
             lines.append(
                 f"{category_name}: {format_currency(spent)} / {format_currency(budget_amount)} gastados ({percentage}%)."
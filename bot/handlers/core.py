@@ -22,11 +22,13 @@ from bot.keyboards import (
 from bot.handlers.categories import category_management_menu
 from bot.handlers.reporting import generate_transactions_excel
 from bot.handlers.transactions import _format_transaction_button_text as format_transaction_button_text
+from bot.services.transactions import fetch_recent_transactions
+from bot.services.user_cache import get_user_snapshot
 from bot.utils.amounts import format_currency
 from bot.utils.callback_manager import CallbackManager
 from bot.utils.time_utils import get_now_utc
 from database import SessionLocal
-from models import Budget, Category, CategoryType, Goal, Transaction, User
+from models import Category, CategoryType, Transaction, User
 
 logger = get_logger("handlers.core")
 
@@ -175,23 +177,9 @@ async def settings_reset_confirm(
 
     # 1) Borrar datos en BD
     with SessionLocal() as session:
-        user = (
-            session.query(User)
-            .filter(User.telegram_id == telegram_id)
-            .first()
-        )
-
+        user = session.get(User, telegram_id)
         if user is not None:
-            # Borrar entidades relacionadas al usuario explícitamente
-            # Aunque cascade debería funcionar, lo hacemos explícito para asegurar
-            session.query(Transaction).filter_by(user_id=user.telegram_id).delete()
-            session.query(Budget).filter_by(user_id=user.telegram_id).delete()
-            session.query(Goal).filter_by(user_id=user.telegram_id).delete()
-            # Borrar categorías personalizadas (las default se recrean en onboarding)
-            session.query(Category).filter_by(
-                user_id=user.telegram_id, is_default=False
-            ).delete()
-            # Finalmente borrar el usuario (esto también borrará cualquier relación restante)
+            # ON DELETE CASCADE elimina categorías, transacciones, presupuestos y metas.
             session.delete(user)
             session.commit()
 
@@ -266,14 +254,7 @@ async def settings_delete_recent_handler(
     await query.answer()
 
     with SessionLocal() as session:
-        transactions = list(
-            session.execute(
-                select(Transaction)
-                .where(Transaction.user_id == telegram_user.id)
-                .order_by(Transaction.transaction_date.desc())
-                .limit(5)
-            ).scalars()
-        )
+        transactions = fetch_recent_transactions(session, telegram_user.id)
 
     if not transactions:
         await query.edit_message_text(
@@ -328,31 +309,19 @@ async def settings_quick_stats(
         next_month = month_start.replace(month=month_start.month + 1)
 
     with SessionLocal() as session:
-        # Total gastos del mes
-        expenses_query = (
-            select(func.sum(Transaction.amount))
-            .join(Category, Transaction.category_id == Category.id)
+        # Totales de ingresos y gastos del mes en una sola agregación
+        totals_query = (
+            select(Transaction.category_type, func.sum(Transaction.amount))
             .where(
                 Transaction.user_id == telegram_user.id,
-                Category.type == CategoryType.EXPENSE,
                 Transaction.transaction_date >= month_start,
                 Transaction.transaction_date < next_month,
             )
+            .group_by(Transaction.category_type)
         )
-        total_expenses = session.execute(expenses_query).scalar() or 0
-
-        # Total ingresos del mes
-        income_query = (
-            select(func.sum(Transaction.amount))
-            .join(Category, Transaction.category_id == Category.id)
-            .where(
-                Transaction.user_id == telegram_user.id,
-                Category.type == CategoryType.INCOME,
-                Transaction.transaction_date >= month_start,
-                Transaction.transaction_date < next_month,
-            )
-        )
-        total_income = session.execute(income_query).scalar() or 0
+        totals = dict(session.execute(totals_query).all())
+        total_expenses = totals.get(CategoryType.EXPENSE.value) or 0
+        total_income = totals.get(CategoryType.INCOME.value) or 0
 
         # Balance
         balance = total_income - total_expenses
@@ -363,7 +332,7 @@ async def settings_quick_stats(
             .join(Transaction, Transaction.category_id == Category.id)
             .where(
                 Transaction.user_id == telegram_user.id,
-                Category.type == CategoryType.EXPENSE,
+                Transaction.category_type == CategoryType.EXPENSE,
                 Transaction.transaction_date >= month_start,
                 Transaction.transaction_date < next_month,
             )
@@ -373,7 +342,7 @@ async def settings_quick_stats(
         )
         top_category_result = session.execute(top_category_query).first()
 
-        user = session.get(User, telegram_user.id)
+        user = get_user_snapshot(session, telegram_user.id)
         currency = user.default_currency if user else "COP"
 
     stats_text = (
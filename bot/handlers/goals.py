@@ -5,7 +5,7 @@ from __future__ import annotations
 from decimal import Decimal, InvalidOperation
 from typing import List
 
-from sqlalchemy import select
+from sqlalchemy import select, update as sql_update
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes, ConversationHandler
 
@@ -276,8 +276,12 @@ async def goal_contribution_amount_received(
             context.user_data.pop("goal_contribution", None)
             return ConversationHandler.END
 
-        current_amount = goal.current_amount or Decimal("0")
-        goal.current_amount = current_amount + contribution
+        # Incremento atómico en la base de datos: evita perder aportes concurrentes.
+        session.execute(
+            sql_update(Goal)
+            .where(Goal.id == goal.id)
+            .values(current_amount=Goal.current_amount + contribution)
+        )
         session.commit()
 
         target_amount = goal.target_amount or Decimal("0")
@@ -25,6 +25,7 @@ from bot.services.categories import (
     create_default_categories,
     ensure_categories_exist,
 )
+from bot.services.user_cache import get_user_snapshot
 from database import SessionLocal
 from models import CategoryType, User
 
@@ -82,8 +83,12 @@ async def onboarding_start(
 
     # Toda la lógica de BD se resuelve dentro de la sesión
     with SessionLocal() as session:
-        user = _ensure_user(session, telegram_user.id, chat.id)
-        is_onboarded = bool(user.is_onboarded)
+        snapshot = get_user_snapshot(session, telegram_user.id)
+        if snapshot is not None and snapshot.chat_id == chat.id:
+            is_onboarded = snapshot.is_onboarded
+        else:
+            user = _ensure_user(session, telegram_user.id, chat.id)
+            is_onboarded = bool(user.is_onboarded)
 
     # Fuera del with NO volvemos a tocar `user`
     if is_onboarded:
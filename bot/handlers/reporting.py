@@ -8,7 +8,7 @@ from datetime import datetime, timezone
 
 import matplotlib
 import pandas as pd
-from sqlalchemy import func, select, text
+from sqlalchemy import func, select
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 
@@ -46,7 +46,7 @@ def _generate_monthly_report_chart(
             .join(Transaction, Transaction.category_id == Category.id)
             .where(
                 Transaction.user_id == user_id,
-                Category.type == CategoryType.EXPENSE,
+                Transaction.category_type == CategoryType.EXPENSE,
                 Transaction.transaction_date >= month_start,
                 Transaction.transaction_date < next_month,
             )
@@ -90,28 +90,23 @@ def _generate_monthly_report_chart(
 
 
 def generate_transactions_excel(user_id: int) -> io.BytesIO:
-    query = text(
-        """
-        SELECT
-            t.id,
-            t.amount,
-            t.transaction_date,
-            t.description,
-            c.name AS category_name,
-            c.type AS category_type
-        FROM transactions t
-        JOIN categories c ON c.id = t.category_id
-        WHERE t.user_id = :user_id
-        ORDER BY t.transaction_date ASC
-        """
+    # Consulta ORM: amount pasa por MinorUnitAmount y llega ya en pesos.
+    query = (
+        select(
+            Transaction.id,
+            Transaction.amount,
+            Transaction.transaction_date,
+            Transaction.description,
+            Category.name.label("category_name"),
+            Transaction.category_type,
+        )
+        .join(Category, Category.id == Transaction.category_id)
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.transaction_date.asc())
     )
 
     with engine.connect() as connection:
-        df = pd.read_sql(
-            query,
-            connection,
-            params={"user_id": user_id},
-        )
+        df = pd.read_sql(query, connection)
 
     if not df.empty:
         df["amount"] = df["amount"].astype(float)
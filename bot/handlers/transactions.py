@@ -23,6 +23,7 @@ from bot.conversation_states import (
 )
 from bot.keyboards import build_category_keyboard
 from bot.services.categories import create_default_categories, get_default_category
+from bot.services.transactions import fetch_recent_transactions
 from bot.utils.amounts import format_currency, parse_amount
 from database import SessionLocal
 from models import Category, CategoryType, Transaction
@@ -509,14 +510,7 @@ async def show_recent_transactions(
         return
 
     with SessionLocal() as session:
-        transactions = list(
-            session.execute(
-                select(Transaction)
-                .where(Transaction.user_id == telegram_user.id)
-                .order_by(Transaction.transaction_date.desc())
-                .limit(5)
-            ).scalars()
-        )
+        transactions = fetch_recent_transactions(session, telegram_user.id)
 
     if not transactions:
         await update.message.reply_text("No encontré transacciones recientes.")
@@ -527,7 +521,7 @@ async def show_recent_transactions(
             [
                 InlineKeyboardButton(
                     text=_format_transaction_button_text(transaction),
-                    callback_data=f"del_tx_{transaction.id}",
+                    callback_data=CallbackManager.delete_transaction(transaction.id),
                 )
             ]
             for transaction in transactions
@@ -561,7 +555,8 @@ async def delete_transaction_callback(
         return
 
     with SessionLocal() as session:
-        transaction = session.get(Transaction, transaction_id)
+        # La PK es (id, user_id): la búsqueda va directo a la partición del usuario.
+        transaction = session.get(Transaction, (transaction_id, telegram_user.id))
         if not transaction or transaction.user_id != telegram_user.id:
             await query.edit_message_text(
                 "No encontré la transacción, tal vez ya fue eliminada."
@@ -271,7 +271,7 @@ class AIService:
         )
         if category.type != expected_category_type:
             raise ValueError(
-                f"Category {category.name} (ID: {category_id}) is of type {category.type.value}, "
+                f"Category {category.name} (ID: {category_id}) is of type {CategoryType(category.type).value}, "
                 f"but transaction type is {transaction_type}"
             )
 
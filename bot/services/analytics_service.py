@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import os
+import re
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Tuple
@@ -18,6 +19,10 @@ from database import SessionLocal
 
 logger = get_logger("services.analytics_service")
 
+# Bloque de código markdown (```sql ... ``` o ``` ... ```) alrededor del SQL generado;
+# tolera que falte el cierre
+_FENCE_RE = re.compile(r"```(?:sql)?\s*(.*?)\s*(?:```|\Z)", re.DOTALL | re.IGNORECASE)
+
 
 class AnalyticsService:
     """Service for answering financial questions by generating and executing safe SQL queries."""
@@ -159,20 +164,33 @@ class AnalyticsService:
         ESQUEMA DE BASE DE DATOS:
         
         Tabla: transactions
-        - id (Integer, PK)
+        - id (BigInteger, PK)
         - user_id (BigInteger, FK -> users.telegram_id)
-        - category_id (Integer, FK -> categories.id)
-        - amount (Numeric(10, 2)) - Monto en COP
-        - transaction_date (DateTime) - Fecha y hora en UTC
+        - category_id (BigInteger, FK -> categories.id)
+        - amount (BigInteger) - Monto en centavos de COP (dividir entre 100 para obtener pesos)
+        - transaction_date (TIMESTAMPTZ) - Fecha y hora con zona horaria, registrada en UTC
         - description (String, nullable)
+        - category_type (String: 'income' o 'expense') - Copia de categories.type; filtrar por ella evita el JOIN
         
         Tabla: categories
-        - id (Integer, PK)
+        - id (BigInteger, PK)
         - user_id (BigInteger, FK -> users.telegram_id)
-        - name (String)
-        - type (Enum: 'INCOME' o 'EXPENSE' en MAYÚSCULAS)
+        - name (CITEXT) - Comparación sin distinguir mayúsculas
+        - type (String: 'income' o 'expense' en minúsculas)
         - is_default (Boolean)
         
+        Vista: mv_user_category_month (totales mensuales precalculados; preferirla para meses cerrados)
+        - user_id (BigInteger)
+        - category_id (BigInteger)
+        - year_month (Date) - Primer día del mes en UTC
+        - total_minor (BigInteger) - Total del mes en centavos de COP
+        - tx_count (BigInteger) - Número de transacciones del mes
+        
+        Vista: v_budget_status (presupuestos frente al gasto del mes actual en UTC)
+        - budget_id (BigInteger), user_id (BigInteger), category_id (BigInteger), category_name (CITEXT)
+        - amount, spent, remaining (BigInteger) - Centavos de COP
+        - pct_used (Numeric) - Porcentaje usado, NULL si el presupuesto es 0
+        
         REGLA CRÍTICA DE TIMEZONE:
         - Convertir transaction_date a America/Bogota antes de filtrar por fecha
         """
@@ -210,14 +228,9 @@ SQL:"""
             sql_query = response.text.strip()
             
             # Clean up SQL if wrapped in markdown code blocks
-            if "```sql" in sql_query.lower():
-                sql_start = sql_query.lower().find("```sql") + 6
-                sql_end = sql_query.lower().find("```", sql_start)
-                sql_query = sql_query[sql_start:sql_end].strip()
-            elif "```" in sql_query:
-                sql_start = sql_query.find("```") + 3
-                sql_end = sql_query.find("```", sql_start)
-                sql_query = sql_query[sql_start:sql_end].strip()
+            fence = _FENCE_RE.search(sql_query)
+            if fence:
+                sql_query = fence.group(1).strip()
             
             # Remove trailing semicolons
             sql_query = sql_query.rstrip(";").strip()
@@ -0,0 +1,73 @@
+"""Bulk loading of transactions for large imports."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy.orm import Session
+
+from models import DESCRIPTION_MAX_LENGTH, MinorUnitAmount, Transaction
+
+COPY_COLUMNS = (
+    "user_id",
+    "category_id",
+    "amount",
+    "transaction_date",
+    "description",
+    "goal_id",
+)
+COPY_TYPES = ("int8", "int8", "int8", "timestamptz", "text", "int8")
+
+_amount_type = MinorUnitAmount()
+
+
+def _bounded(row: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Trim ``description`` to the column size, as ``Transaction``'s validator does."""
+    description = row.get("description")
+    if description is None or len(description) <= DESCRIPTION_MAX_LENGTH:
+        return row
+    return {**row, "description": description[:DESCRIPTION_MAX_LENGTH]}
+
+
+def copy_transactions(session: Session, rows: Iterable[Mapping[str, Any]]) -> int:
+    """Load transactions with binary ``COPY FROM STDIN`` and return how many were sent.
+
+    ``rows`` use the same keys as ``Transaction`` (``amount`` in pesos). COPY
+    skips SQL parsing and planning per row; row triggers still fire, so
+    ``category_type`` and goal accrual stay consistent. Binary COPY needs
+    psycopg 3; with any other driver this falls back to
+    ``Transaction.bulk_insert`` (multi-row INSERT batches).
+
+    Neither path goes through the ORM validators, so descriptions are
+    trimmed here to ``DESCRIPTION_MAX_LENGTH`` before loading.
+
+    Runs inside the session transaction; committing is left to the caller.
+    """
+    rows = [_bounded(row) for row in rows]
+    if not rows:
+        return 0
+
+    connection = session.connection()
+    if connection.dialect.driver != "psycopg":
+        return Transaction.bulk_insert(session, rows)
+
+    now = datetime.now(timezone.utc)
+    statement = (
+        f"COPY transactions ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT BINARY)"
+    )
+    dbapi_connection = connection.connection.driver_connection
+    with dbapi_connection.cursor() as cursor, cursor.copy(statement) as copy:
+        copy.set_types(COPY_TYPES)
+        for row in rows:
+            copy.write_row(
+                (
+                    row["user_id"],
+                    row["category_id"],
+                    _amount_type.process_bind_param(row["amount"], connection.dialect),
+                    row.get("transaction_date") or now,
+                    row.get("description"),
+                    row.get("goal_id"),
+                )
+            )
+    return len(rows)
@@ -4,10 +4,11 @@ from __future__ import annotations
 
 from typing import Dict, Iterable, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from models import Category, CategoryType
+from models import CATEGORY_NAME_MAX_LENGTH, Category, CategoryType
 
 DEFAULT_CATEGORY_DEFINITIONS: List[Dict[str, object]] = [
     {"name": "General", "type": CategoryType.EXPENSE, "is_default": True},
@@ -25,6 +26,19 @@ DEFAULT_CATEGORY_DEFINITIONS: List[Dict[str, object]] = [
 ]
 
 
+def _insert_missing_categories(session: Session, rows: List[Dict[str, object]]) -> None:
+    """Insert category rows in one statement, skipping those that already exist."""
+    if not rows:
+        return
+    result = session.execute(
+        pg_insert(Category)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["user_id", "name", "type"])
+    )
+    if result.rowcount:
+        session.commit()
+
+
 def create_default_categories(
     session: Session,
     user_id: int,
@@ -32,36 +46,23 @@ def create_default_categories(
     selected_names: Optional[Iterable[str]] = None,
 ) -> None:
     """Ensure the user has the selected default categories."""
-    existing_names = {
-        row.name
-        for row in session.execute(
-            select(Category.name).where(Category.user_id == user_id)
-        )
-    }
-
     desired_names = (
         {name.strip() for name in selected_names} if selected_names else None
     )
 
-    categories_to_add: List[Category] = []
-    for definition in DEFAULT_CATEGORY_DEFINITIONS:
-        name = definition["name"]
-        if name in existing_names:
-            continue
-        if desired_names is not None and name not in desired_names:
-            continue
-        categories_to_add.append(
-            Category(
-                user_id=user_id,
-                name=name,
-                type=definition["type"],
-                is_default=definition["is_default"],
-            )
-        )
-
-    if categories_to_add:
-        session.add_all(categories_to_add)
-        session.commit()
+    _insert_missing_categories(
+        session,
+        [
+            {
+                "user_id": user_id,
+                "name": definition["name"],
+                "type": definition["type"],
+                "is_default": definition["is_default"],
+            }
+            for definition in DEFAULT_CATEGORY_DEFINITIONS
+            if desired_names is None or definition["name"] in desired_names
+        ],
+    )
 
 
 def get_default_category(
@@ -71,13 +72,16 @@ def get_default_category(
 ) -> Optional[Category]:
     """Return the default category of a type for the user."""
     return session.execute(
-        select(Category)
-        .where(
-            Category.user_id == user_id,
-            Category.type == category_type,
-            Category.is_default.is_(True),
+        lambda_stmt(
+            lambda: select(Category)
+            .where(
+                Category.user_id == user_id,
+                Category.type == category_type,
+                # Predicado idéntico al del índice parcial ix_cat_user_default.
+                Category.is_default,
+            )
+            .limit(1)
         )
-        .limit(1)
     ).scalar_one_or_none()
 
 
@@ -101,35 +105,26 @@ def ensure_categories_exist(
     is_default: bool = False,
 ) -> None:
     """Create categories that do not exist yet for the user."""
-    normalized_names = {name.strip() for name in category_names if name.strip()}
-    if not normalized_names:
-        return
-
-    existing = {
-        row.name
-        for row in session.execute(
-            select(Category.name).where(
-                Category.user_id == user_id,
-                Category.type == category_type,
-            )
-        )
+    # El INSERT directo no pasa por los validadores del modelo.
+    normalized_names = {
+        name.strip()[:CATEGORY_NAME_MAX_LENGTH]
+        for name in category_names
+        if name.strip()
     }
-
-    to_create = normalized_names - existing
-    if not to_create:
+    if not normalized_names:
         return
 
-    session.add_all(
+    _insert_missing_categories(
+        session,
         [
-            Category(
-                user_id=user_id,
-                name=name,
-                type=category_type,
-                is_default=is_default,
-            )
-            for name in to_create
-        ]
+            {
+                "user_id": user_id,
+                "name": name,
+                "type": category_type,
+                "is_default": is_default,
+            }
+            for name in sorted(normalized_names)
+        ],
     )
-    session.commit()
 
 
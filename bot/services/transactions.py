@@ -0,0 +1,28 @@
+"""Transaction related persistence helpers."""
+
+from __future__ import annotations
+
+from typing import List
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from models import Transaction
+
+
+def fetch_recent_transactions(
+    session: Session, user_id: int, limit: int = 5
+) -> List[Transaction]:
+    """Return the user's most recent transactions, newest first.
+
+    ``lambda_stmt`` caches the constructed statement by the lambda's code
+    location; ``user_id`` and ``limit`` are extracted as bound parameters, so
+    repeated calls skip building the query and computing its cache key.
+    """
+    statement = lambda_stmt(
+        lambda: select(Transaction)
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.transaction_date.desc())
+        .limit(limit)
+    )
+    return list(session.execute(statement).scalars())
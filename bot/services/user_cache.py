@@ -0,0 +1,90 @@
+"""In-process read cache for the few user columns read on hot paths."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from models import User
+
+USER_CACHE_MAXSIZE = 10_000
+USER_CACHE_TTL_SECONDS = 300.0
+
+
+class UserSnapshot(NamedTuple):
+    """Read-only copy of the user columns that rarely change."""
+
+    telegram_id: int
+    chat_id: int
+    default_currency: str
+    is_onboarded: bool
+
+
+_cache: "OrderedDict[int, Tuple[float, UserSnapshot]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_user_snapshot(session: Session, telegram_id: int) -> Optional[UserSnapshot]:
+    """Return the cached snapshot for the user, loading it with a single SELECT on a miss.
+
+    Missing users are not cached, so a user created right after a miss is found
+    on the next call.
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(telegram_id)
+        if entry is not None:
+            expires_at, snapshot = entry
+            if expires_at > now:
+                _cache.move_to_end(telegram_id)
+                return snapshot
+            del _cache[telegram_id]
+
+    row = session.execute(
+        lambda_stmt(
+            lambda: select(User.chat_id, User.default_currency, User.is_onboarded).where(
+                User.telegram_id == telegram_id
+            )
+        )
+    ).first()
+    if row is None:
+        return None
+
+    snapshot = UserSnapshot(
+        telegram_id=telegram_id,
+        chat_id=row.chat_id,
+        default_currency=row.default_currency,
+        is_onboarded=bool(row.is_onboarded),
+    )
+    with _lock:
+        _cache[telegram_id] = (now + USER_CACHE_TTL_SECONDS, snapshot)
+        _cache.move_to_end(telegram_id)
+        while len(_cache) > USER_CACHE_MAXSIZE:
+            _cache.popitem(last=False)
+    return snapshot
+
+
+def invalidate_user(telegram_id: int) -> None:
+    """Drop the cached snapshot for the user, if any."""
+    with _lock:
+        _cache.pop(telegram_id, None)
+
+
+def clear_user_cache() -> None:
+    """Drop every cached snapshot."""
+    with _lock:
+        _cache.clear()
+
+
+# ORM flushes of User keep the cache coherent. Bulk ``update(User)`` /
+# ``delete(User)`` statements bypass these events and must call
+# ``invalidate_user`` themselves.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    invalidate_user(target.telegram_id)
@@ -4,13 +4,26 @@ Este módulo proporciona una interfaz segura para generar y parsear
 callback_data, asegurando que no se exceda el límite de 64 bytes de Telegram
 y proporcionando validación de tipos.
 """
+import re
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, Tuple
 
 
 # Límite de bytes para callback_data en Telegram
 MAX_CALLBACK_DATA_BYTES = 64
 
+# Entradas cacheadas por cada generador de callbacks con ID numérico
+ID_CALLBACK_CACHE_SIZE = 4096
+
+# Prefijo del tipo y resto del callback_data, compilado una sola vez
+_CB_SPLIT = re.compile(r"([a-z]{1,3}):(.*)", re.DOTALL)
+
+
+def _byte_length(text: str) -> int:
+    """Longitud en bytes UTF-8; en texto ASCII (el caso común) es len() sin codificar."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
 
 class CallbackType(Enum):
     """Tipos de callbacks con prefijos cortos para ahorrar bytes."""
@@ -43,6 +56,13 @@ class CallbackType(Enum):
     RENAME_CATEGORY = "rc"  # ren_cat_{id} -> rc:{id}
 
 
+# Largo máximo del payload ASCII por tipo: 64 menos el prefijo y el separador
+_MAX_PAYLOAD = {
+    callback_type: MAX_CALLBACK_DATA_BYTES - len(callback_type.value) - 1
+    for callback_type in CallbackType
+}
+
+
 class CallbackManager:
     """Manager para generar y parsear callback_data de forma segura."""
     
@@ -58,7 +78,7 @@ class CallbackManager:
         Raises:
             ValueError: Si el callback_data excede 64 bytes.
         """
-        byte_length = len(callback_data.encode("utf-8"))
+        byte_length = _byte_length(callback_data)
         if byte_length > MAX_CALLBACK_DATA_BYTES:
             raise ValueError(
                 f"Callback data excede el límite de {MAX_CALLBACK_DATA_BYTES} bytes. "
@@ -80,9 +100,12 @@ class CallbackManager:
         Raises:
             ValueError: Si el callback excede 64 bytes.
         """
-        parts_list = [callback_type.value] + list(parts)
-        callback_data = CallbackManager.SEPARATOR.join(parts_list)
-        CallbackManager._validate_length(callback_data)
+        separator = CallbackManager.SEPARATOR
+        payload = separator.join(parts)
+        callback_data = f"{callback_type.value}{separator}{payload}"
+        # Payload ASCII dentro de la cota precalculada: no hace falta medir bytes
+        if not (payload.isascii() and len(payload) <= _MAX_PAYLOAD[callback_type]):
+            CallbackManager._validate_length(callback_data)
         return callback_data
     
     @staticmethod
@@ -99,21 +122,52 @@ class CallbackManager:
         Raises:
             ValueError: Si el callback no tiene el formato esperado.
         """
-        parts = callback_data.split(CallbackManager.SEPARATOR)
-        if not parts:
-            raise ValueError(f"Callback data vacío: {callback_data}")
+        match = _CB_SPLIT.fullmatch(callback_data)
+        if match is None:
+            raise ValueError(f"Formato de callback inválido: {callback_data}")
         
-        if parts[0] != expected_type.value:
+        prefix, rest = match.groups()
+        if prefix != expected_type.value:
             raise ValueError(
                 f"Tipo de callback inesperado. Esperado: {expected_type.value}, "
-                f"recibido: {parts[0]}. Callback: {callback_data}"
+                f"recibido: {prefix}. Callback: {callback_data}"
             )
         
-        return tuple(parts[1:])
+        return tuple(rest.split(CallbackManager.SEPARATOR))
+    
+    @staticmethod
+    def _parse_action(callback_data: str, expected_type: CallbackType) -> Tuple[str, ...]:
+        """Parsea un callback "prefijo:acción[:argumento]" con str.partition.
+        
+        El argumento conserva los ":" que contenga (ej: nombres de categoría)
+        y se devuelve aunque esté vacío ("o:toggle:" -> ("toggle", "")).
+        
+        Args:
+            callback_data: String del callback_data a parsear.
+            expected_type: Tipo esperado del callback.
+        
+        Returns:
+            Tuple[str, ...]: (acción,) o (acción, argumento).
+        
+        Raises:
+            ValueError: Si el callback no tiene el formato esperado.
+        """
+        prefix, separator, rest = callback_data.partition(CallbackManager.SEPARATOR)
+        if not separator:
+            raise ValueError(f"Formato de callback inválido: {callback_data}")
+        if prefix != expected_type.value:
+            raise ValueError(
+                f"Tipo de callback inesperado. Esperado: {expected_type.value}, "
+                f"recibido: {prefix}. Callback: {callback_data}"
+            )
+        
+        action, separator, payload = rest.partition(CallbackManager.SEPARATOR)
+        return (action, payload) if separator else (action,)
     
     # ========== MÉTODOS DE GENERACIÓN ==========
     
     @staticmethod
+    @lru_cache(maxsize=ID_CALLBACK_CACHE_SIZE)
     def category(category_id: int) -> str:
         """Genera callback para selección de categoría.
         
@@ -126,6 +180,7 @@ class CallbackManager:
         return CallbackManager._build_callback(CallbackType.CATEGORY, str(category_id))
     
     @staticmethod
+    @lru_cache(maxsize=ID_CALLBACK_CACHE_SIZE)
     def delete_transaction(transaction_id: int) -> str:
         """Genera callback para eliminar transacción.
         
@@ -138,32 +193,43 @@ class CallbackManager:
         return CallbackManager._build_callback(CallbackType.DELETE_TRANSACTION, str(transaction_id))
     
     @staticmethod
-    def settings(action: str, *args: str) -> str:
+    def settings(action: str, arg: Optional[str] = None) -> str:
         """Genera callback para acciones de settings.
         
+        Admite un solo argumento: parse_settings lo devuelve entero, con
+        los ":" que contenga.
+        
         Args:
             action: Acción de settings (ej: "back", "currency", "export").
-            *args: Argumentos adicionales (ej: código de moneda).
+            arg: Argumento opcional (ej: código de moneda).
         
         Returns:
             str: Callback data (ej: "s:back", "s:currency:COP").
         """
-        return CallbackManager._build_callback(CallbackType.SETTINGS, action, *args)
+        if arg is None:
+            return CallbackManager._build_callback(CallbackType.SETTINGS, action)
+        return CallbackManager._build_callback(CallbackType.SETTINGS, action, arg)
     
     @staticmethod
-    def onboarding(action: str, *args: str) -> str:
+    def onboarding(action: str, arg: Optional[str] = None) -> str:
         """Genera callback para acciones de onboarding.
         
+        Admite un solo argumento: parse_onboarding lo devuelve entero, con
+        los ":" que contenga.
+        
         Args:
             action: Acción de onboarding (ej: "start", "toggle", "finish").
-            *args: Argumentos adicionales (ej: nombre de categoría).
+            arg: Argumento opcional (ej: nombre de categoría).
         
         Returns:
             str: Callback data (ej: "o:start", "o:toggle:Comida").
         """
-        return CallbackManager._build_callback(CallbackType.ONBOARDING, action, *args)
+        if arg is None:
+            return CallbackManager._build_callback(CallbackType.ONBOARDING, action)
+        return CallbackManager._build_callback(CallbackType.ONBOARDING, action, arg)
     
     @staticmethod
+    @lru_cache(maxsize=ID_CALLBACK_CACHE_SIZE)
     def goal_contribution(goal_id: int) -> str:
         """Genera callback para aportar a una meta.
         
@@ -200,6 +266,7 @@ class CallbackManager:
         return CallbackManager._build_callback(CallbackType.BUDGETS, action)
     
     @staticmethod
+    @lru_cache(maxsize=ID_CALLBACK_CACHE_SIZE)
     def budget_category(category_id: int) -> str:
         """Genera callback para selección de categoría en presupuesto.
         
@@ -298,7 +365,7 @@ class CallbackManager:
         Raises:
             ValueError: Si el formato es inválido.
         """
-        return CallbackManager._parse_callback(callback_data, CallbackType.SETTINGS)
+        return CallbackManager._parse_action(callback_data, CallbackType.SETTINGS)
     
     @staticmethod
     def parse_onboarding(callback_data: str) -> Tuple[str, ...]:
@@ -313,7 +380,7 @@ class CallbackManager:
         Raises:
             ValueError: Si el formato es inválido.
         """
-        return CallbackManager._parse_callback(callback_data, CallbackType.ONBOARDING)
+        return CallbackManager._parse_action(callback_data, CallbackType.ONBOARDING)
     
     @staticmethod
     def parse_goal_contribution(callback_data: str) -> int:
@@ -442,6 +509,7 @@ class CallbackManager:
         return parts[0]
     
     @staticmethod
+    @lru_cache(maxsize=ID_CALLBACK_CACHE_SIZE)
     def delete_category(category_id: int) -> str:
         """Genera callback para eliminar categoría.
         
@@ -454,6 +522,7 @@ class CallbackManager:
         return CallbackManager._build_callback(CallbackType.DELETE_CATEGORY, str(category_id))
     
     @staticmethod
+    @lru_cache(maxsize=ID_CALLBACK_CACHE_SIZE)
     def rename_category(category_id: int) -> str:
         """Genera callback para renombrar categoría.
         
@@ -14,7 +14,7 @@ from flask import (
     url_for,
 )
 from jwt import ExpiredSignatureError, InvalidTokenError
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select
 
 from database import SessionLocal
 from models import Category, Transaction
@@ -76,35 +76,46 @@ def dashboard_home() -> str:
 
     db = SessionLocal()
     try:
-        transactions = (
-            db.query(Transaction)
-            .options(selectinload(Transaction.category))
-            .filter(Transaction.user_id == user_id)
+        # Solo las columnas que usa la plantilla: tuplas en lugar de objetos ORM.
+        rows = db.execute(
+            select(
+                Transaction.amount,
+                Transaction.transaction_date,
+                Transaction.description,
+                Category.name.label("category_name"),
+                Transaction.category_type,
+            )
+            .outerjoin(Category, Transaction.category_id == Category.id)
+            .where(Transaction.user_id == user_id)
             .order_by(Transaction.transaction_date.desc())
-            .all()
-        )
+        ).all()
 
         total_income = Decimal("0")
         total_expense = Decimal("0")
-
-        for tx in transactions:
-            amount = Decimal(tx.amount)
-            category = tx.category
-
-            tx.is_income = False  # type: ignore[attr-defined]
-            tx.is_expense = False  # type: ignore[attr-defined]
-            tx.abs_amount = amount.copy_abs()  # type: ignore[attr-defined]
-
-            if not isinstance(category, Category) or not category.type:
-                continue
-
-            category_type = category.type.value
-            if category_type == "income":
-                total_income += amount.copy_abs()
-                tx.is_income = True  # type: ignore[attr-defined]
-            elif category_type == "expense":
-                total_expense += amount.copy_abs()
-                tx.is_expense = True  # type: ignore[attr-defined]
+        transactions = []
+
+        for row in rows:
+            amount = Decimal(row.amount)
+            abs_amount = amount.copy_abs()
+            is_income = row.category_type == "income"
+            is_expense = row.category_type == "expense"
+
+            if is_income:
+                total_income += abs_amount
+            elif is_expense:
+                total_expense += abs_amount
+
+            transactions.append(
+                {
+                    "amount": amount,
+                    "abs_amount": abs_amount,
+                    "transaction_date": row.transaction_date,
+                    "description": row.description,
+                    "category_name": row.category_name,
+                    "is_income": is_income,
+                    "is_expense": is_expense,
+                }
+            )
 
         balance = total_income - total_expense
 
@@ -2,6 +2,7 @@ import os
 from typing import Optional
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 
@@ -35,11 +36,23 @@ if not DATABASE_URL:
     raise ValueError("Error: La variable de entorno DATABASE_URL no está configurada.")
 
 
+_engine_options = {
+    # Filas por sentencia multi-VALUES en inserciones masivas (ver models.BULK_CHUNK_SIZE).
+    "insertmanyvalues_page_size": 10_000,
+    # Sentencias compiladas en caché (por defecto 500); los handlers generan
+    # muchas variantes pequeñas de consultas por usuario.
+    "query_cache_size": 2048,
+}
+if make_url(DATABASE_URL).get_driver_name() == "psycopg2":
+    # Agrupa también los UPDATE/DELETE de executemany con execute_batch.
+    _engine_options["executemany_mode"] = "values_plus_batch"
+
 engine = create_engine(
     DATABASE_URL,
     future=True,
     echo=False,
     pool_pre_ping=True,
+    **_engine_options,
 )
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
@@ -6,16 +6,22 @@ from telegram import Update
 from bot import build_application
 from database import Base, engine
 
+_ALLOWED_UPDATES = Update.ALL_TYPES
+
 
 def init_db() -> None:
-    Base.metadata.create_all(bind=engine)
+    # Las vistas no se crean como tablas: las crean los listeners
+    # after_create de models.py.
+    tables = [table for table in Base.metadata.sorted_tables if not table.info.get("is_view")]
+    Base.metadata.create_all(bind=engine, tables=tables)
 
 
 def configure_logging() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        )
     logging.getLogger("httpx").setLevel(logging.INFO)
     logging.getLogger("telegram").setLevel(logging.INFO)
 
@@ -52,7 +58,7 @@ def main() -> None:
         port=port,
         url_path=webhook_path,
         webhook_url=webhook_url,
-        allowed_updates=Update.ALL_TYPES,
+        allowed_updates=_ALLOWED_UPDATES,
         drop_pending_updates=True,
     )
 
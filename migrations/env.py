@@ -18,6 +18,7 @@ except ImportError:
 from database import Base
 # Importar todos los modelos para que se registren en Base.metadata
 from models import Category, Goal, Transaction, User, Budget  # noqa: F401
+from models import TRANSACTION_PARTITION_NAME
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -32,6 +33,20 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Excluir de autogenerate las vistas y las particiones de transactions.
+
+    Las particiones reflejadas de la base no tienen modelo; sin este filtro
+    autogenerate emitiría DROP TABLE para cada una.
+    """
+    if type_ != "table":
+        return True
+    if reflected and TRANSACTION_PARTITION_NAME.fullmatch(name):
+        return False
+    return not object.info.get("is_view")
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -62,6 +77,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -82,7 +98,9 @@ def run_migrations_online() -> None:
     
     with engine.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
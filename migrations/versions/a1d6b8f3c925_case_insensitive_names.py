@@ -0,0 +1,68 @@
+"""Case-insensitive category and goal names
+
+Revision ID: a1d6b8f3c925
+Revises: f2a7c9e4d561
+Create Date: 2025-12-12 15:26:03.775140
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d6b8f3c925'
+down_revision: Union[str, None] = 'f2a7c9e4d561'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME_COLUMNS = ('categories', 'goals')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS citext')
+
+    # uq_cat_user_name_type pasa a ser case-insensitive: fusionar antes las
+    # categorías que solo difieren en mayúsculas.
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE category_case_merge ON COMMIT DROP AS
+        SELECT id AS duplicate_id, keep_id
+        FROM (
+            SELECT id, min(id) OVER (PARTITION BY user_id, lower(name), type) AS keep_id
+            FROM categories
+        ) ranked
+        WHERE id <> keep_id
+        """
+    )
+    for table in ('transactions', 'budgets'):
+        op.execute(
+            f"""
+            UPDATE {table} SET category_id = m.keep_id
+            FROM category_case_merge m
+            WHERE {table}.category_id = m.duplicate_id
+            """
+        )
+    op.execute('DELETE FROM categories USING category_case_merge m WHERE categories.id = m.duplicate_id')
+
+    for table in NAME_COLUMNS:
+        op.alter_column(
+            table,
+            'name',
+            existing_type=sa.String(),
+            type_=postgresql.CITEXT(),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    for table in NAME_COLUMNS:
+        op.alter_column(
+            table,
+            'name',
+            existing_type=postgresql.CITEXT(),
+            type_=sa.String(),
+            existing_nullable=False,
+        )
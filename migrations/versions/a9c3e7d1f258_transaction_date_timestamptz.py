@@ -0,0 +1,72 @@
+"""Transaction date as timestamptz with server default
+
+Revision ID: a9c3e7d1f258
+Revises: f4d2a6e8b135
+Create Date: 2025-12-09 15:02:37.418560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c3e7d1f258'
+down_revision: Union[str, None] = 'f4d2a6e8b135'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_monthly_spend_view(month_expression: str) -> None:
+    op.execute(
+        f"""
+        CREATE MATERIALIZED VIEW mv_user_category_month AS
+        SELECT
+            user_id,
+            category_id,
+            date_trunc('month', {month_expression})::date AS year_month,
+            SUM(amount)::bigint AS total_minor,
+            COUNT(*) AS tx_count
+        FROM transactions
+        GROUP BY 1, 2, 3
+        WITH DATA
+        """
+    )
+    op.create_index(
+        'ux_mv_user_category_month',
+        'mv_user_category_month',
+        ['user_id', 'category_id', 'year_month'],
+        unique=True,
+    )
+
+
+def upgrade() -> None:
+    # La vista materializada depende de la columna y bloquea el ALTER TYPE.
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_user_category_month')
+    # Los valores existentes son UTC sin zona horaria.
+    op.alter_column(
+        'transactions',
+        'transaction_date',
+        existing_type=sa.DateTime(),
+        type_=sa.DateTime(timezone=True),
+        existing_nullable=False,
+        server_default=sa.text('now()'),
+        postgresql_using="transaction_date AT TIME ZONE 'UTC'",
+    )
+    # El mes se sigue calculando en UTC, sin depender del TimeZone de la sesión.
+    _create_monthly_spend_view("transaction_date AT TIME ZONE 'UTC'")
+
+
+def downgrade() -> None:
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_user_category_month')
+    op.alter_column(
+        'transactions',
+        'transaction_date',
+        existing_type=sa.DateTime(timezone=True),
+        type_=sa.DateTime(),
+        existing_nullable=False,
+        server_default=None,
+        postgresql_using="transaction_date AT TIME ZONE 'UTC'",
+    )
+    _create_monthly_spend_view('transaction_date')
@@ -0,0 +1,43 @@
+"""Add partial indexes for default categories and pending onboarding
+
+Revision ID: b3e8d2f7c604
+Revises: a9c3e7d1f258
+Create Date: 2025-12-10 09:21:05.337914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8d2f7c604'
+down_revision: Union[str, None] = 'a9c3e7d1f258'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_cat_user_default',
+            'categories',
+            ['user_id'],
+            postgresql_where=sa.text('is_default'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_not_onboarded',
+            'users',
+            ['telegram_id'],
+            postgresql_where=sa.text('NOT is_onboarded'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_not_onboarded', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_cat_user_default', table_name='categories', postgresql_concurrently=True)
@@ -0,0 +1,77 @@
+"""Add hot path indexes
+
+Revision ID: b7c41d9e2a10
+Revises: a418b1819e67
+Create Date: 2025-12-08 10:12:44.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41d9e2a10'
+down_revision: Union[str, None] = 'a418b1819e67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tx_user_date',
+            'transactions',
+            ['user_id', sa.text('transaction_date DESC')],
+            postgresql_include=['amount', 'category_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tx_user_cat_date',
+            'transactions',
+            ['user_id', 'category_id', 'transaction_date'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_budget_user_cat_range',
+            'budgets',
+            ['user_id', 'category_id', 'start_date', 'end_date'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_categories_user_id'),
+            'categories',
+            ['user_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_transactions_category_id'),
+            'transactions',
+            ['category_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_budgets_category_id'),
+            'budgets',
+            ['category_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_goals_user_id'),
+            'goals',
+            ['user_id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_goals_user_id'), table_name='goals', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_budgets_category_id'), table_name='budgets', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_transactions_category_id'), table_name='transactions', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_categories_user_id'), table_name='categories', postgresql_concurrently=True)
+        op.drop_index('ix_budget_user_cat_range', table_name='budgets', postgresql_concurrently=True)
+        op.drop_index('ix_tx_user_cat_date', table_name='transactions', postgresql_concurrently=True)
+        op.drop_index('ix_tx_user_date', table_name='transactions', postgresql_concurrently=True)
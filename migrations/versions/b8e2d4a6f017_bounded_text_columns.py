@@ -0,0 +1,124 @@
+"""Bounded text columns with length checks
+
+Revision ID: b8e2d4a6f017
+Revises: a1d6b8f3c925
+Create Date: 2025-12-13 11:52:40.093318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2d4a6f017'
+down_revision: Union[str, None] = 'a1d6b8f3c925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabla, columna, longitud máxima, nombre del CHECK); name es CITEXT y
+# conserva su tipo, el límite lo impone el CHECK.
+NAME_LIMITS = (
+    ('categories', 'name', 64, 'ck_category_name_length'),
+    ('goals', 'name', 128, 'ck_goal_name_length'),
+)
+
+
+# Sufijo ' (n)' para los nombres de categoría que quedarían repetidos al recortarse.
+CATEGORY_DEDUP_SUFFIX = "' (' || r.rn || ')'"
+
+
+def _truncate_category_names(max_length: int) -> None:
+    """Recorta los nombres de categoría sin violar uq_cat_user_name_type.
+
+    Dos nombres largos con el mismo prefijo, o uno largo cuyo prefijo ya
+    existe, chocarían en la restricción única (case-insensitive). Por
+    usuario y tipo, el primer nombre de cada grupo (los que ya caben van
+    primero) conserva el prefijo y los siguientes reciben el sufijo.
+    """
+    op.execute(
+        f"""
+        WITH ranked AS (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id, type, lower(left(name, {max_length}))
+                ORDER BY char_length(name) > {max_length}, id
+            ) AS rn
+            FROM categories
+        )
+        UPDATE categories c
+        SET name = CASE
+            WHEN r.rn = 1 THEN left(c.name, {max_length})
+            ELSE left(c.name, {max_length} - char_length({CATEGORY_DEDUP_SUFFIX}))
+                || {CATEGORY_DEDUP_SUFFIX}
+        END
+        FROM ranked r
+        WHERE c.id = r.id AND char_length(c.name) > {max_length}
+        """
+    )
+
+
+def upgrade() -> None:
+    # Recortar datos existentes que excedan los nuevos límites.
+    op.execute(
+        "UPDATE users SET default_currency = 'COP' WHERE char_length(default_currency) <> 3"
+    )
+    op.execute(
+        'UPDATE transactions SET description = left(description, 255) '
+        'WHERE char_length(description) > 255'
+    )
+    for table, column, max_length, _ in NAME_LIMITS:
+        if table == 'categories':
+            _truncate_category_names(max_length)
+            continue
+        op.execute(
+            f'UPDATE {table} SET {column} = left({column}, {max_length}) '
+            f'WHERE char_length({column}) > {max_length}'
+        )
+
+    op.alter_column(
+        'users',
+        'default_currency',
+        existing_type=sa.String(),
+        type_=postgresql.VARCHAR(3, collation='C'),
+        existing_nullable=False,
+    )
+    op.create_check_constraint(
+        'ck_users_currency_length',
+        'users',
+        'char_length(default_currency) = 3',
+    )
+    op.alter_column(
+        'transactions',
+        'description',
+        existing_type=sa.String(),
+        type_=sa.String(length=255),
+        existing_nullable=True,
+    )
+    for table, column, max_length, constraint_name in NAME_LIMITS:
+        op.create_check_constraint(
+            constraint_name,
+            table,
+            f'char_length({column}) <= {max_length}',
+        )
+
+
+def downgrade() -> None:
+    for table, _, _, constraint_name in NAME_LIMITS:
+        op.drop_constraint(constraint_name, table, type_='check')
+    op.alter_column(
+        'transactions',
+        'description',
+        existing_type=sa.String(length=255),
+        type_=sa.String(),
+        existing_nullable=True,
+    )
+    op.drop_constraint('ck_users_currency_length', 'users', type_='check')
+    op.alter_column(
+        'users',
+        'default_currency',
+        existing_type=postgresql.VARCHAR(3, collation='C'),
+        type_=sa.String(),
+        existing_nullable=False,
+    )
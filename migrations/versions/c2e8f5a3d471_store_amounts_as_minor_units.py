@@ -0,0 +1,49 @@
+"""Store amounts as minor units
+
+Revision ID: c2e8f5a3d471
+Revises: b7c41d9e2a10
+Create Date: 2025-12-08 11:47:03.529914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e8f5a3d471'
+down_revision: Union[str, None] = 'b7c41d9e2a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AMOUNT_COLUMNS = (
+    ('transactions', 'amount'),
+    ('budgets', 'amount'),
+    ('goals', 'target_amount'),
+    ('goals', 'current_amount'),
+)
+
+
+def upgrade() -> None:
+    for table, column in AMOUNT_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.BigInteger(),
+            existing_type=sa.Numeric(precision=10, scale=2),
+            existing_nullable=False,
+            postgresql_using=f'({column} * 100)::bigint',
+        )
+
+
+def downgrade() -> None:
+    for table, column in AMOUNT_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.Numeric(precision=10, scale=2),
+            existing_type=sa.BigInteger(),
+            existing_nullable=False,
+            postgresql_using=f'({column} / 100.0)::numeric(10, 2)',
+        )
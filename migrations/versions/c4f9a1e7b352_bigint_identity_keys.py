@@ -0,0 +1,128 @@
+"""Bigint identity primary keys
+
+Revision ID: c4f9a1e7b352
+Revises: b8e2d4a6f017
+Create Date: 2025-12-13 17:20:57.614829
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from models import CATEGORY_TYPE_TRIGGER_DDL, GOAL_ACCRUAL_TRIGGER_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f9a1e7b352'
+down_revision: Union[str, None] = 'b8e2d4a6f017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tablas cuyo id pasa de SERIAL a IDENTITY. transactions conserva su
+# secuencia: IDENTITY en tablas particionadas requiere Postgres 17.
+IDENTITY_TABLES = ('categories', 'budgets', 'goals')
+
+# Columnas que referencian los ids ampliados.
+REFERENCING_COLUMNS = (
+    ('transactions', 'category_id'),
+    ('transactions', 'goal_id'),
+    ('budgets', 'category_id'),
+)
+
+# Triggers creados por CATEGORY_TYPE_TRIGGER_DDL y GOAL_ACCRUAL_TRIGGER_DDL.
+# Postgres no permite cambiar el tipo de una columna usada en la definición
+# de un trigger (UPDATE OF ... o WHEN), así que se recrean alrededor del ALTER.
+TRIGGERS = (
+    ('trg_transactions_category_type', 'transactions'),
+    ('trg_categories_propagate_type', 'categories'),
+    ('tx_goal_accrue', 'transactions'),
+    ('tx_goal_release', 'transactions'),
+    ('tx_goal_reassign', 'transactions'),
+)
+
+
+def _create_monthly_spend_view() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_user_category_month AS
+        SELECT
+            user_id,
+            category_id,
+            date_trunc('month', transaction_date AT TIME ZONE 'UTC')::date AS year_month,
+            SUM(amount)::bigint AS total_minor,
+            COUNT(*) AS tx_count
+        FROM transactions
+        GROUP BY 1, 2, 3
+        WITH DATA
+        """
+    )
+    op.create_index(
+        'ux_mv_user_category_month',
+        'mv_user_category_month',
+        ['user_id', 'category_id', 'year_month'],
+        unique=True,
+    )
+
+
+def _restart_sequence(table: str) -> None:
+    op.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"coalesce(max(id), 0) + 1, false) FROM {table}"
+    )
+
+
+def _drop_triggers() -> None:
+    for trigger, table in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger} ON {table}')
+
+
+def _create_triggers() -> None:
+    # Las funciones usan CREATE OR REPLACE; los triggers se acaban de borrar.
+    for statement in CATEGORY_TYPE_TRIGGER_DDL + GOAL_ACCRUAL_TRIGGER_DDL:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    # La vista materializada depende de transactions.category_id.
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_user_category_month')
+
+    for table in IDENTITY_TABLES:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT')
+        op.execute(f'DROP SEQUENCE IF EXISTS {table}_id_seq')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN id TYPE BIGINT')
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN id '
+            f'ADD GENERATED ALWAYS AS IDENTITY (CACHE 50)'
+        )
+        _restart_sequence(table)
+
+    op.execute('ALTER TABLE transactions ALTER COLUMN id TYPE BIGINT')
+    op.execute('ALTER SEQUENCE transactions_id_seq AS BIGINT CACHE 50')
+
+    _drop_triggers()
+    for table, column in REFERENCING_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT')
+    _create_triggers()
+
+    _create_monthly_spend_view()
+
+
+def downgrade() -> None:
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_user_category_month')
+
+    _drop_triggers()
+    for table, column in REFERENCING_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE INTEGER')
+    _create_triggers()
+
+    op.execute('ALTER SEQUENCE transactions_id_seq AS INTEGER CACHE 1')
+    op.execute('ALTER TABLE transactions ALTER COLUMN id TYPE INTEGER')
+
+    for table in IDENTITY_TABLES:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN id DROP IDENTITY')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN id TYPE INTEGER')
+        op.execute(f'CREATE SEQUENCE {table}_id_seq AS INTEGER OWNED BY {table}.id')
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+        _restart_sequence(table)
+
+    _create_monthly_spend_view()
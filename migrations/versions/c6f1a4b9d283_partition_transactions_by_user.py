@@ -0,0 +1,124 @@
+"""Partition transactions by hash of user_id
+
+Revision ID: c6f1a4b9d283
+Revises: b3e8d2f7c604
+Create Date: 2025-12-10 16:48:51.902417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1a4b9d283'
+down_revision: Union[str, None] = 'b3e8d2f7c604'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITION_COUNT = 16
+
+TRANSACTION_COLUMNS = 'id, user_id, category_id, amount, transaction_date, description'
+
+
+def _create_monthly_spend_view() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_user_category_month AS
+        SELECT
+            user_id,
+            category_id,
+            date_trunc('month', transaction_date AT TIME ZONE 'UTC')::date AS year_month,
+            SUM(amount)::bigint AS total_minor,
+            COUNT(*) AS tx_count
+        FROM transactions
+        GROUP BY 1, 2, 3
+        WITH DATA
+        """
+    )
+    op.create_index(
+        'ux_mv_user_category_month',
+        'mv_user_category_month',
+        ['user_id', 'category_id', 'year_month'],
+        unique=True,
+    )
+
+
+def _create_transaction_indexes() -> None:
+    op.create_index(
+        'ix_tx_user_date',
+        'transactions',
+        ['user_id', sa.text('transaction_date DESC')],
+        postgresql_include=['amount', 'category_id'],
+    )
+    op.create_index(
+        'ix_tx_user_cat_date',
+        'transactions',
+        ['user_id', 'category_id', 'transaction_date'],
+    )
+    op.create_index(
+        op.f('ix_transactions_category_id'),
+        'transactions',
+        ['category_id'],
+    )
+
+
+def _rebuild_transactions(partitioned: bool) -> None:
+    """Recrea ``transactions`` con otra estructura copiando las filas existentes."""
+    # La vista materializada depende de la tabla.
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_user_category_month')
+
+    # Liberar los nombres de la tabla, su llave primaria y sus índices.
+    op.rename_table('transactions', 'transactions_old')
+    op.execute('ALTER TABLE transactions_old RENAME CONSTRAINT transactions_pkey TO transactions_old_pkey')
+    op.drop_index('ix_tx_user_date', table_name='transactions_old')
+    op.drop_index('ix_tx_user_cat_date', table_name='transactions_old')
+    op.drop_index(op.f('ix_transactions_category_id'), table_name='transactions_old')
+
+    # En una tabla particionada la llave de partición debe formar parte de la PK.
+    primary_key = '(id, user_id)' if partitioned else '(id)'
+    partition_clause = 'PARTITION BY HASH (user_id)' if partitioned else ''
+    op.execute(
+        f"""
+        CREATE TABLE transactions (
+            id INTEGER NOT NULL DEFAULT nextval('transactions_id_seq'),
+            user_id BIGINT NOT NULL,
+            category_id INTEGER NOT NULL,
+            amount BIGINT NOT NULL,
+            transaction_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            description VARCHAR,
+            CONSTRAINT transactions_pkey PRIMARY KEY {primary_key},
+            CONSTRAINT transactions_user_id_fkey FOREIGN KEY (user_id)
+                REFERENCES users (telegram_id) ON DELETE CASCADE,
+            CONSTRAINT transactions_category_id_fkey FOREIGN KEY (category_id)
+                REFERENCES categories (id) ON DELETE CASCADE
+        ) {partition_clause}
+        """
+    )
+    if partitioned:
+        for remainder in range(PARTITION_COUNT):
+            op.execute(
+                f'CREATE TABLE transactions_p{remainder} PARTITION OF transactions '
+                f'FOR VALUES WITH (MODULUS {PARTITION_COUNT}, REMAINDER {remainder})'
+            )
+
+    op.execute(
+        f'INSERT INTO transactions ({TRANSACTION_COLUMNS}) '
+        f'SELECT {TRANSACTION_COLUMNS} FROM transactions_old'
+    )
+    # La secuencia pertenece a la tabla vieja y se borraría junto con ella.
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id')
+    op.drop_table('transactions_old')
+
+    # Sobre la tabla particionada los índices se propagan a cada partición.
+    _create_transaction_indexes()
+    _create_monthly_spend_view()
+
+
+def upgrade() -> None:
+    _rebuild_transactions(partitioned=True)
+
+
+def downgrade() -> None:
+    _rebuild_transactions(partitioned=False)
@@ -0,0 +1,27 @@
+"""Budget status view
+
+Revision ID: d2b7f5c8e460
+Revises: c4f9a1e7b352
+Create Date: 2025-12-14 10:33:16.847052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from models import BUDGET_STATUS_VIEW_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7f5c8e460'
+down_revision: Union[str, None] = 'c4f9a1e7b352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(BUDGET_STATUS_VIEW_DDL)
+
+
+def downgrade() -> None:
+    op.execute('DROP VIEW IF EXISTS v_budget_status')
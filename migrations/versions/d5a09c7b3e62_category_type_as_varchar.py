@@ -0,0 +1,50 @@
+"""Category type as varchar
+
+Revision ID: d5a09c7b3e62
+Revises: c2e8f5a3d471
+Create Date: 2025-12-08 15:03:26.781450
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a09c7b3e62'
+down_revision: Union[str, None] = 'c2e8f5a3d471'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # El ENUM guardaba los nombres ('INCOME'/'EXPENSE'); ahora se guardan los valores.
+    op.alter_column(
+        'categories',
+        'type',
+        type_=sa.String(length=8),
+        existing_type=sa.Enum('INCOME', 'EXPENSE', name='category_type'),
+        existing_nullable=False,
+        postgresql_using='lower(type::text)',
+    )
+    op.execute('DROP TYPE IF EXISTS category_type')
+    op.create_check_constraint(
+        'ck_category_type',
+        'categories',
+        "type IN ('income', 'expense')",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_category_type', 'categories', type_='check')
+    category_type = sa.Enum('INCOME', 'EXPENSE', name='category_type')
+    category_type.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        'categories',
+        'type',
+        type_=category_type,
+        existing_type=sa.String(length=8),
+        existing_nullable=False,
+        postgresql_using='upper(type)::category_type',
+    )
@@ -0,0 +1,84 @@
+"""Denormalize category type into transactions
+
+Revision ID: d9b5e1c7a346
+Revises: c6f1a4b9d283
+Create Date: 2025-12-11 10:05:29.661730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b5e1c7a346'
+down_revision: Union[str, None] = 'c6f1a4b9d283'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('category_type', sa.String(length=8), nullable=True))
+    op.execute(
+        """
+        UPDATE transactions t
+        SET category_type = c.type
+        FROM categories c
+        WHERE c.id = t.category_id
+        """
+    )
+    op.alter_column('transactions', 'category_type', existing_type=sa.String(length=8), nullable=False)
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION copy_category_type() RETURNS trigger AS $$
+        BEGIN
+            SELECT type INTO NEW.category_type FROM categories WHERE id = NEW.category_id;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_transactions_category_type
+        BEFORE INSERT OR UPDATE OF category_id ON transactions
+        FOR EACH ROW EXECUTE FUNCTION copy_category_type()
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION propagate_category_type() RETURNS trigger AS $$
+        BEGIN
+            UPDATE transactions SET category_type = NEW.type WHERE category_id = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_categories_propagate_type
+        AFTER UPDATE OF type ON categories
+        FOR EACH ROW WHEN (OLD.type IS DISTINCT FROM NEW.type)
+        EXECUTE FUNCTION propagate_category_type()
+        """
+    )
+
+    # La tabla está particionada: el índice se crea en cada partición.
+    op.create_index(
+        'ix_tx_user_type_date',
+        'transactions',
+        ['user_id', 'category_type', 'transaction_date'],
+        postgresql_include=['amount'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tx_user_type_date', table_name='transactions')
+    op.execute('DROP TRIGGER IF EXISTS trg_categories_propagate_type ON categories')
+    op.execute('DROP FUNCTION IF EXISTS propagate_category_type()')
+    op.execute('DROP TRIGGER IF EXISTS trg_transactions_category_type ON transactions')
+    op.execute('DROP FUNCTION IF EXISTS copy_category_type()')
+    op.drop_column('transactions', 'category_type')
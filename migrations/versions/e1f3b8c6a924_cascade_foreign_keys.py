@@ -0,0 +1,49 @@
+"""Cascade foreign keys on delete
+
+Revision ID: e1f3b8c6a924
+Revises: d5a09c7b3e62
+Create Date: 2025-12-09 09:21:57.304118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f3b8c6a924'
+down_revision: Union[str, None] = 'd5a09c7b3e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabla, columna, tabla referida, columna referida)
+FOREIGN_KEYS = (
+    ('categories', 'user_id', 'users', 'telegram_id'),
+    ('transactions', 'user_id', 'users', 'telegram_id'),
+    ('transactions', 'category_id', 'categories', 'id'),
+    ('budgets', 'user_id', 'users', 'telegram_id'),
+    ('budgets', 'category_id', 'categories', 'id'),
+    ('goals', 'user_id', 'users', 'telegram_id'),
+)
+
+
+def _recreate_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, column, referred_table, referred_column in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name,
+            table,
+            referred_table,
+            [column],
+            [referred_column],
+            ondelete=ondelete,
+        )
+
+
+def upgrade() -> None:
+    _recreate_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    _recreate_foreign_keys(None)
@@ -0,0 +1,52 @@
+"""Unique category name per user and type
+
+Revision ID: e7c4f0a2b918
+Revises: d9b5e1c7a346
+Create Date: 2025-12-11 14:37:12.208457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c4f0a2b918'
+down_revision: Union[str, None] = 'd9b5e1c7a346'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fusionar duplicados previos en la categoría de menor id antes de
+    # crear la restricción.
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE category_merge ON COMMIT DROP AS
+        SELECT id AS duplicate_id, keep_id
+        FROM (
+            SELECT id, min(id) OVER (PARTITION BY user_id, name, type) AS keep_id
+            FROM categories
+        ) ranked
+        WHERE id <> keep_id
+        """
+    )
+    for table in ('transactions', 'budgets'):
+        op.execute(
+            f"""
+            UPDATE {table} SET category_id = m.keep_id
+            FROM category_merge m
+            WHERE {table}.category_id = m.duplicate_id
+            """
+        )
+    op.execute('DELETE FROM categories USING category_merge m WHERE categories.id = m.duplicate_id')
+
+    op.create_unique_constraint(
+        'uq_cat_user_name_type',
+        'categories',
+        ['user_id', 'name', 'type'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_cat_user_name_type', 'categories', type_='unique')
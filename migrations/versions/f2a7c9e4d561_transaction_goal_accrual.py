@@ -0,0 +1,90 @@
+"""Link transactions to goals and accrue goal totals by trigger
+
+Revision ID: f2a7c9e4d561
+Revises: e7c4f0a2b918
+Create Date: 2025-12-12 09:14:48.530266
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c9e4d561'
+down_revision: Union[str, None] = 'e7c4f0a2b918'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('goal_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'transactions_goal_id_fkey',
+        'transactions',
+        'goals',
+        ['goal_id'],
+        ['id'],
+        ondelete='SET NULL',
+    )
+    op.create_index(
+        'ix_tx_goal_id',
+        'transactions',
+        ['goal_id'],
+        postgresql_where=sa.text('goal_id IS NOT NULL'),
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION accrue_goal_amount() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.goal_id IS NOT NULL THEN
+                UPDATE goals SET current_amount = current_amount - OLD.amount
+                WHERE id = OLD.goal_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.goal_id IS NOT NULL THEN
+                UPDATE goals SET current_amount = current_amount + NEW.amount
+                WHERE id = NEW.goal_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tx_goal_accrue
+        AFTER INSERT ON transactions
+        FOR EACH ROW WHEN (NEW.goal_id IS NOT NULL)
+        EXECUTE FUNCTION accrue_goal_amount()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tx_goal_release
+        AFTER DELETE ON transactions
+        FOR EACH ROW WHEN (OLD.goal_id IS NOT NULL)
+        EXECUTE FUNCTION accrue_goal_amount()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tx_goal_reassign
+        AFTER UPDATE OF amount, goal_id ON transactions
+        FOR EACH ROW WHEN (
+            OLD.goal_id IS DISTINCT FROM NEW.goal_id OR OLD.amount IS DISTINCT FROM NEW.amount
+        )
+        EXECUTE FUNCTION accrue_goal_amount()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS tx_goal_reassign ON transactions')
+    op.execute('DROP TRIGGER IF EXISTS tx_goal_release ON transactions')
+    op.execute('DROP TRIGGER IF EXISTS tx_goal_accrue ON transactions')
+    op.execute('DROP FUNCTION IF EXISTS accrue_goal_amount()')
+    op.drop_index('ix_tx_goal_id', table_name='transactions')
+    op.drop_constraint('transactions_goal_id_fkey', 'transactions', type_='foreignkey')
+    op.drop_column('transactions', 'goal_id')
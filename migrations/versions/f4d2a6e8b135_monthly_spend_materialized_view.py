@@ -0,0 +1,72 @@
+"""Monthly spend materialized view
+
+Revision ID: f4d2a6e8b135
+Revises: e1f3b8c6a924
+Create Date: 2025-12-09 12:40:18.662091
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4d2a6e8b135'
+down_revision: Union[str, None] = 'e1f3b8c6a924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_user_category_month AS
+        SELECT
+            user_id,
+            category_id,
+            date_trunc('month', transaction_date)::date AS year_month,
+            SUM(amount)::bigint AS total_minor,
+            COUNT(*) AS tx_count
+        FROM transactions
+        GROUP BY 1, 2, 3
+        WITH DATA
+        """
+    )
+    # El índice único es requisito de REFRESH MATERIALIZED VIEW CONCURRENTLY.
+    op.create_index(
+        'ux_mv_user_category_month',
+        'mv_user_category_month',
+        ['user_id', 'category_id', 'year_month'],
+        unique=True,
+    )
+    # Si pg_cron está disponible, programar el refresco cada 5 minutos.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+                PERFORM cron.schedule(
+                    'refresh_mv_user_category_month',
+                    '*/5 * * * *',
+                    'REFRESH MATERIALIZED VIEW CONCURRENTLY mv_user_category_month'
+                );
+            END IF;
+        END
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+                PERFORM cron.unschedule('refresh_mv_user_category_month');
+            END IF;
+        END
+        $$
+        """
+    )
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_user_category_month')
@@ -1,37 +1,162 @@
-from datetime import date, datetime, timezone
+import re
+from decimal import ROUND_HALF_UP, Decimal
 from enum import Enum as PyEnum
+from typing import Any, Iterable, Mapping, Optional
 
 from sqlalchemy import (
     BigInteger,
     Boolean,
+    CheckConstraint,
     Column,
+    DDL,
     Date,
     DateTime,
-    Enum,
+    FetchedValue,
     ForeignKey,
-    Integer,
+    Identity,
+    Index,
     Numeric,
     String,
+    TypeDecorator,
+    UniqueConstraint,
+    event,
+    func,
+    insert,
+    text,
+    update,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import CITEXT, VARCHAR
+from sqlalchemy.orm import Session, relationship, validates
+from sqlalchemy.types import TypeEngine
 
 from database import Base
 
 
-def _get_utc_now() -> datetime:
-    """Función callable para usar como default en SQLAlchemy Column.
-    
-    Retorna la fecha y hora actual en UTC (timezone-aware).
-    Esta función debe usarse como default en Column(DateTime, default=_get_utc_now)
-    para asegurar que cada vez que se crea un registro, se obtiene el tiempo actual.
-    
-    Returns:
-        datetime: Fecha y hora actual en UTC con timezone info.
+# COP se maneja con dos decimales: 1 peso = 100 unidades menores.
+MINOR_UNITS_PER_UNIT = 100
+# Valor de una unidad menor (0.01); fija la escala de los montos leídos.
+MINOR_UNIT = Decimal(1) / MINOR_UNITS_PER_UNIT
+
+
+class MinorUnitAmount(TypeDecorator):
+    """Monto almacenado como BIGINT en unidades menores (centavos).
+
+    La base de datos guarda y agrega enteros de 8 bytes; en Python el valor
+    se expone como ``Decimal`` con dos decimales, de modo que los handlers
+    siguen trabajando con montos en pesos. Las consultas SQL crudas deben
+    dividir entre ``MINOR_UNITS_PER_UNIT`` para obtener el monto en COP.
     """
-    return datetime.now(timezone.utc)
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value))
+        return int(
+            (value * MINOR_UNITS_PER_UNIT).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
+        )
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return (Decimal(value) / MINOR_UNITS_PER_UNIT).quantize(MINOR_UNIT)
+
+
+# Postgres admite como máximo 65 535 parámetros por sentencia; con las ~5
+# columnas insertables de Transaction, 10 000 filas por lote quedan por debajo.
+BULK_CHUNK_SIZE = 10_000
+
+
+class BulkOperationsMixin:
+    """Inserciones y actualizaciones masivas sin instanciar objetos ORM.
+
+    ``session.execute(insert(cls), filas)`` usa ``insertmanyvalues`` de
+    SQLAlchemy 2.0: cada lote se envía como un único
+    ``INSERT ... VALUES (...), (...)`` en lugar de una ida y vuelta por fila.
+    """
+
+    @classmethod
+    def bulk_insert(
+        cls,
+        session: Session,
+        mappings: Iterable[Mapping[str, Any]],
+        chunk: int = BULK_CHUNK_SIZE,
+    ) -> int:
+        """Inserta ``mappings`` en lotes de ``chunk`` filas; retorna el total insertado.
+
+        No hace commit: la transacción queda a cargo del llamador.
+        """
+        rows = list(mappings)
+        for start in range(0, len(rows), chunk):
+            session.execute(insert(cls), rows[start:start + chunk])
+        return len(rows)
+
+    @classmethod
+    def bulk_update(
+        cls,
+        session: Session,
+        mappings: Iterable[Mapping[str, Any]],
+    ) -> None:
+        """Actualiza por llave primaria; cada dict debe incluir todas sus columnas.
+
+        Con PK compuesta se necesitan todas: en Transaction, ``id`` y
+        ``user_id`` (la llave de partición). Lanza ``ValueError`` si a alguna
+        fila le falta una.
+
+        Con ``executemany_mode="values_plus_batch"`` psycopg2 agrupa los
+        UPDATE en lotes en vez de ejecutarlos uno a uno.
+        """
+        rows = list(mappings)
+        primary_key = [column.key for column in cls.__table__.primary_key]
+        for row in rows:
+            missing = [key for key in primary_key if key not in row]
+            if missing:
+                raise ValueError(
+                    f"bulk_update de {cls.__name__} requiere la llave primaria "
+                    f"completa; faltan {missing} en {dict(row)}"
+                )
+        if rows:
+            session.execute(update(cls), rows)
+
+
+CURRENCY_CODE_LENGTH = 3
+CATEGORY_NAME_MAX_LENGTH = 64
+GOAL_NAME_MAX_LENGTH = 128
+DESCRIPTION_MAX_LENGTH = 255
 
 
-class CategoryType(PyEnum):
+def _case_insensitive_name(max_length: int) -> TypeEngine:
+    """Nombre comparado sin distinguir mayúsculas.
+
+    En Postgres es CITEXT, de modo que ``name == valor`` y los índices sobre
+    name son case-insensitive; CITEXT no admite longitud, así que el límite
+    se impone con un CHECK en la tabla.
+    """
+    return String(max_length).with_variant(CITEXT(), "postgresql")
+
+
+# categories y goals usan CITEXT: la extensión se crea antes que cualquier
+# tabla, sin depender del orden de create_all.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS citext").execute_if(dialect="postgresql"),
+)
+
+
+def _truncate(value: Optional[str], max_length: int) -> Optional[str]:
+    """Recorta texto libre del usuario al tamaño de la columna."""
+    if value is None:
+        return None
+    return value[:max_length]
+
+
+class CategoryType(str, PyEnum):
+    """Tipos de categoría; al heredar de ``str`` se compara y se enlaza como texto."""
+
     INCOME = "income"
     EXPENSE = "expense"
 
@@ -39,69 +164,446 @@ class CategoryType(PyEnum):
 class User(Base):
     __tablename__ = "users"
 
-    telegram_id = Column(BigInteger, primary_key=True, unique=True)
+    telegram_id = Column(BigInteger, primary_key=True)
     chat_id = Column(BigInteger, nullable=False)
-    default_currency = Column(String, default="COP", nullable=False)
+    # Código ISO 4217 en ASCII: la intercalación "C" compara byte a byte.
+    default_currency = Column(
+        String(CURRENCY_CODE_LENGTH).with_variant(
+            VARCHAR(CURRENCY_CODE_LENGTH, collation="C"), "postgresql"
+        ),
+        default="COP",
+        nullable=False,
+    )
     is_onboarded = Column(Boolean, default=False, nullable=False)
 
-    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan")
-    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
-    budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan")
-    goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
+    __table_args__ = (
+        CheckConstraint(
+            f"char_length(default_currency) = {CURRENCY_CODE_LENGTH}",
+            name="ck_users_currency_length",
+        ),
+        # Índice parcial: solo contiene a los usuarios pendientes de onboarding.
+        Index(
+            "ix_users_not_onboarded",
+            telegram_id,
+            postgresql_where=text("NOT is_onboarded"),
+        ),
+    )
+
+    # Los borrados en cascada los resuelve Postgres (FK ON DELETE CASCADE);
+    # el ORM no carga ni borra filas hijas.
+    categories = relationship(
+        "Category",
+        back_populates="user",
+        cascade="save-update, merge",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
+    transactions = relationship(
+        "Transaction",
+        back_populates="user",
+        cascade="save-update, merge",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
+    budgets = relationship(
+        "Budget",
+        back_populates="user",
+        cascade="save-update, merge",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
+    goals = relationship(
+        "Goal",
+        back_populates="user",
+        cascade="save-update, merge",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
 
 
-class Category(Base):
+class Category(BulkOperationsMixin, Base):
     __tablename__ = "categories"
 
-    id = Column(Integer, primary_key=True)
-    user_id = Column(BigInteger, ForeignKey("users.telegram_id"), nullable=False)
-    name = Column(String, nullable=False)
-    type = Column(Enum(CategoryType, name="category_type"), nullable=False)
+    id = Column(BigInteger, Identity(always=True, cache=50), primary_key=True)
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.telegram_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    name = Column(_case_insensitive_name(CATEGORY_NAME_MAX_LENGTH), nullable=False)
+    type = Column(String(8), nullable=False)
     is_default = Column(Boolean, default=False, nullable=False)
 
+    __table_args__ = (
+        CheckConstraint("type IN ('income', 'expense')", name="ck_category_type"),
+        CheckConstraint(
+            f"char_length(name) <= {CATEGORY_NAME_MAX_LENGTH}",
+            name="ck_category_name_length",
+        ),
+        # Índice parcial: solo indexa las categorías por defecto (una por tipo).
+        Index("ix_cat_user_default", user_id, postgresql_where=text("is_default")),
+        # Árbitro de INSERT ... ON CONFLICT DO NOTHING al sembrar categorías.
+        UniqueConstraint(user_id, name, type, name="uq_cat_user_name_type"),
+    )
+
     user = relationship("User", back_populates="categories")
-    transactions = relationship("Transaction", back_populates="category", cascade="all, delete-orphan")
-    budgets = relationship("Budget", back_populates="category", cascade="all, delete-orphan")
+    transactions = relationship(
+        "Transaction",
+        back_populates="category",
+        cascade="save-update, merge",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
+    budgets = relationship(
+        "Budget",
+        back_populates="category",
+        cascade="save-update, merge",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
 
+    @validates("name")
+    def _validate_name(self, key: str, value: str) -> str:
+        return _truncate(value, CATEGORY_NAME_MAX_LENGTH)
 
-class Transaction(Base):
+
+class Transaction(BulkOperationsMixin, Base):
     __tablename__ = "transactions"
 
-    id = Column(Integer, primary_key=True)
-    user_id = Column(BigInteger, ForeignKey("users.telegram_id"), nullable=False)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
-    amount = Column(Numeric(10, 2), nullable=False)
-    transaction_date = Column(DateTime, default=_get_utc_now, nullable=False)
-    description = Column(String, nullable=True)
+    # La tabla está particionada por HASH (user_id) en Postgres, que exige
+    # incluir la llave de partición en la PK: la identidad es (id, user_id).
+    # id usa una secuencia (BIGSERIAL) y no IDENTITY, que en tablas
+    # particionadas requiere Postgres 17.
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.telegram_id", ondelete="CASCADE"),
+        primary_key=True,
+        autoincrement=False,
+    )
+    category_id = Column(
+        BigInteger,
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    amount = Column(MinorUnitAmount, nullable=False)
+    # Postgres asigna la marca de tiempo al insertar (now() ya es timestamptz,
+    # un instante absoluto); las inserciones masivas pueden omitir la columna.
+    transaction_date = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    description = Column(String(DESCRIPTION_MAX_LENGTH), nullable=True)
+    # Meta a la que aporta la transacción; el trigger tx_goal_accrue mantiene
+    # goals.current_amount como total acumulado.
+    goal_id = Column(
+        BigInteger,
+        ForeignKey("goals.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    # Copia de categories.type mantenida por el trigger
+    # trg_transactions_category_type; evita el JOIN al separar ingresos y gastos.
+    category_type = Column(
+        String(8),
+        nullable=False,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+
+    __table_args__ = (
+        # Listados y sumas por usuario en un rango de fechas; INCLUDE evita
+        # visitar el heap al agregar montos en Postgres.
+        Index(
+            "ix_tx_user_date",
+            user_id,
+            transaction_date.desc(),
+            postgresql_include=["amount", "category_id"],
+        ),
+        Index("ix_tx_user_cat_date", user_id, category_id, transaction_date),
+        Index(
+            "ix_tx_user_type_date",
+            user_id,
+            category_type,
+            transaction_date,
+            postgresql_include=["amount"],
+        ),
+        # Solo las transacciones ligadas a metas; sirve al ON DELETE SET NULL.
+        Index(
+            "ix_tx_goal_id",
+            goal_id,
+            postgresql_where=text("goal_id IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "HASH (user_id)"},
+    )
 
     user = relationship("User", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
+    goal = relationship("Goal", back_populates="transactions")
+
+    @validates("description")
+    def _validate_description(self, key: str, value: Optional[str]) -> Optional[str]:
+        return _truncate(value, DESCRIPTION_MAX_LENGTH)
+
+
+TRANSACTION_PARTITION_COUNT = 16
+# Nombre de las particiones hijas; no están en el metadata, así que
+# migrations/env.py las excluye de autogenerate.
+TRANSACTION_PARTITION_NAME = re.compile(r"transactions_p\d+")
+
+# create_all (init_db) solo crea la tabla padre; sin particiones no admite filas.
+for _remainder in range(TRANSACTION_PARTITION_COUNT):
+    event.listen(
+        Transaction.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE transactions_p{_remainder} PARTITION OF transactions "
+            f"FOR VALUES WITH (MODULUS {TRANSACTION_PARTITION_COUNT}, REMAINDER {_remainder})"
+        ).execute_if(dialect="postgresql"),
+    )
 
+# Funciones y triggers que mantienen transactions.category_type; las
+# migraciones crean los mismos objetos.
+CATEGORY_TYPE_TRIGGER_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION copy_category_type() RETURNS trigger AS $$
+    BEGIN
+        SELECT type INTO NEW.category_type FROM categories WHERE id = NEW.category_id;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_transactions_category_type
+    BEFORE INSERT OR UPDATE OF category_id ON transactions
+    FOR EACH ROW EXECUTE FUNCTION copy_category_type()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION propagate_category_type() RETURNS trigger AS $$
+    BEGIN
+        UPDATE transactions SET category_type = NEW.type WHERE category_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_categories_propagate_type
+    AFTER UPDATE OF type ON categories
+    FOR EACH ROW WHEN (OLD.type IS DISTINCT FROM NEW.type)
+    EXECUTE FUNCTION propagate_category_type()
+    """,
+)
 
-class Budget(Base):
+# Total acumulado de goals.current_amount a partir de las transacciones ligadas.
+GOAL_ACCRUAL_TRIGGER_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION accrue_goal_amount() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.goal_id IS NOT NULL THEN
+            UPDATE goals SET current_amount = current_amount - OLD.amount
+            WHERE id = OLD.goal_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.goal_id IS NOT NULL THEN
+            UPDATE goals SET current_amount = current_amount + NEW.amount
+            WHERE id = NEW.goal_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tx_goal_accrue
+    AFTER INSERT ON transactions
+    FOR EACH ROW WHEN (NEW.goal_id IS NOT NULL)
+    EXECUTE FUNCTION accrue_goal_amount()
+    """,
+    """
+    CREATE TRIGGER tx_goal_release
+    AFTER DELETE ON transactions
+    FOR EACH ROW WHEN (OLD.goal_id IS NOT NULL)
+    EXECUTE FUNCTION accrue_goal_amount()
+    """,
+    """
+    CREATE TRIGGER tx_goal_reassign
+    AFTER UPDATE OF amount, goal_id ON transactions
+    FOR EACH ROW WHEN (
+        OLD.goal_id IS DISTINCT FROM NEW.goal_id OR OLD.amount IS DISTINCT FROM NEW.amount
+    )
+    EXECUTE FUNCTION accrue_goal_amount()
+    """,
+)
+
+for _statement in CATEGORY_TYPE_TRIGGER_DDL + GOAL_ACCRUAL_TRIGGER_DDL:
+    event.listen(
+        Transaction.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
+
+class Budget(BulkOperationsMixin, Base):
     __tablename__ = "budgets"
 
-    id = Column(Integer, primary_key=True)
-    user_id = Column(BigInteger, ForeignKey("users.telegram_id"), nullable=False)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
-    amount = Column(Numeric(10, 2), nullable=False)
+    id = Column(BigInteger, Identity(always=True, cache=50), primary_key=True)
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.telegram_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    category_id = Column(
+        BigInteger,
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    amount = Column(MinorUnitAmount, nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
 
+    __table_args__ = (
+        Index("ix_budget_user_cat_range", user_id, category_id, start_date, end_date),
+    )
+
     user = relationship("User", back_populates="budgets")
     category = relationship("Category", back_populates="budgets")
 
 
-class Goal(Base):
+class Goal(BulkOperationsMixin, Base):
     __tablename__ = "goals"
 
-    id = Column(Integer, primary_key=True)
-    user_id = Column(BigInteger, ForeignKey("users.telegram_id"), nullable=False)
-    name = Column(String, nullable=False)
-    target_amount = Column(Numeric(10, 2), nullable=False)
-    current_amount = Column(Numeric(10, 2), default=0, nullable=False)
+    id = Column(BigInteger, Identity(always=True, cache=50), primary_key=True)
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.telegram_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    name = Column(_case_insensitive_name(GOAL_NAME_MAX_LENGTH), nullable=False)
+    target_amount = Column(MinorUnitAmount, nullable=False)
+    current_amount = Column(MinorUnitAmount, default=0, nullable=False)
     deadline = Column(Date, nullable=True)
 
+    __table_args__ = (
+        CheckConstraint(
+            f"char_length(name) <= {GOAL_NAME_MAX_LENGTH}",
+            name="ck_goal_name_length",
+        ),
+    )
+
     user = relationship("User", back_populates="goals")
+    transactions = relationship(
+        "Transaction",
+        back_populates="goal",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
 
+    @validates("name")
+    def _validate_name(self, key: str, value: str) -> str:
+        return _truncate(value, GOAL_NAME_MAX_LENGTH)
+
+
+class MonthlySpend(Base):
+    """Vista materializada de solo lectura con el total mensual por categoría.
+
+    La crean las migraciones o, con create_all, ``MONTHLY_SPEND_VIEW_DDL``;
+    se refresca periódicamente con ``scripts/refresh_monthly_spend.py`` (o
+    pg_cron), por lo que puede ir rezagada respecto a ``transactions``.
+    """
 
+    __tablename__ = "mv_user_category_month"
+    __table_args__ = {"info": {"is_view": True}}
+
+    user_id = Column(BigInteger, primary_key=True)
+    category_id = Column(BigInteger, primary_key=True)
+    year_month = Column(Date, primary_key=True)
+    total_amount = Column("total_minor", MinorUnitAmount, nullable=False)
+    tx_count = Column(BigInteger, nullable=False)
+
+
+# Definición de mv_user_category_month igual a la de la migración
+# c4f9a1e7b352. IF NOT EXISTS la hace idempotente en cada create_all; el
+# índice único es requisito de REFRESH MATERIALIZED VIEW CONCURRENTLY.
+MONTHLY_SPEND_VIEW_DDL = (
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_user_category_month AS
+    SELECT
+        user_id,
+        category_id,
+        date_trunc('month', transaction_date AT TIME ZONE 'UTC')::date AS year_month,
+        SUM(amount)::bigint AS total_minor,
+        COUNT(*) AS tx_count
+    FROM transactions
+    GROUP BY 1, 2, 3
+    WITH DATA
+    """,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_user_category_month
+    ON mv_user_category_month (user_id, category_id, year_month)
+    """,
+)
+
+# create_all (init_db) omite las tablas marcadas is_view.
+for _statement in MONTHLY_SPEND_VIEW_DDL:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
+
+class BudgetStatus(Base):
+    """Vista de solo lectura: cada presupuesto frente a lo gastado en el mes actual (UTC).
+
+    Reemplaza una consulta SUM por presupuesto con una sola lectura.
+    """
+
+    __tablename__ = "v_budget_status"
+    __table_args__ = {"info": {"is_view": True}}
+
+    budget_id = Column(BigInteger, primary_key=True)
+    user_id = Column(BigInteger, nullable=False)
+    category_id = Column(BigInteger, nullable=False)
+    category_name = Column(String, nullable=True)
+    amount = Column(MinorUnitAmount, nullable=False)
+    spent = Column(MinorUnitAmount, nullable=False)
+    remaining = Column(MinorUnitAmount, nullable=False)
+    pct_used = Column(Numeric(12, 2), nullable=True)
+
+
+# Definición de v_budget_status; la migración d2b7f5c8e460 ejecuta la misma
+# sentencia. El gasto se mide en el mes actual (UTC), igual que el handler de
+# presupuestos; el LATERAL resuelve cada suma con ix_tx_user_cat_date.
+BUDGET_STATUS_VIEW_DDL = """
+    CREATE OR REPLACE VIEW v_budget_status AS
+    SELECT
+        b.id AS budget_id,
+        b.user_id,
+        b.category_id,
+        c.name AS category_name,
+        b.amount,
+        s.spent,
+        b.amount - s.spent AS remaining,
+        round(s.spent * 100.0 / NULLIF(b.amount, 0), 2) AS pct_used
+    FROM budgets b
+    LEFT JOIN categories c ON c.id = b.category_id
+    CROSS JOIN LATERAL (
+        SELECT COALESCE(SUM(t.amount), 0)::bigint AS spent
+        FROM transactions t
+        WHERE t.user_id = b.user_id
+          AND t.category_id = b.category_id
+          AND t.transaction_date >= date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+          AND t.transaction_date < (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '1 month') AT TIME ZONE 'UTC'
+    ) s
+    """
+
+# create_all (init_db) omite las tablas marcadas is_view; la vista se crea al
+# final, cuando ya existen budgets, categories y transactions. OR REPLACE la
+# hace idempotente: el evento se dispara en cada create_all.
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(BUDGET_STATUS_VIEW_DDL).execute_if(dialect="postgresql"),
+)
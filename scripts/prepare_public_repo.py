@@ -7,14 +7,23 @@ Este script:
 2. Filtra archivos sensibles (no copia)
 3. Sanitiza prompts de IA en archivos específicos
 4. Crea .env.example con placeholders
+
+Con VERBOSE=1 muestra también los mensajes de detalle de cada paso.
 """
 
+import ast
+import errno
+import io
 import os
 import re
 import shutil
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Set
+from typing import Callable, Dict, FrozenSet, Iterator, Optional, Set, Tuple
 
 # Colores para output
 class Colors:
@@ -28,29 +37,55 @@ class Colors:
     BOLD = '\033[1m'
 
 
+# Mensajes de detalle solo con VERBOSE=1
+VERBOSE = os.getenv('VERBOSE') == '1'
+
+# Los mensajes se acumulan y se escriben en bloque al final de cada fase
+_output = io.StringIO()
+_output_lock = threading.Lock()
+
+
+def _emit(text: str) -> None:
+    """Buffer one output line."""
+    with _output_lock:
+        _output.write(text)
+        _output.write('\n')
+
+
+def flush_output() -> None:
+    """Write the buffered messages to stdout in one call."""
+    with _output_lock:
+        data = _output.getvalue()
+        _output.seek(0)
+        _output.truncate()
+    if data:
+        sys.stdout.write(data)
+        sys.stdout.flush()
+
+
 def print_header(text: str) -> None:
     """Print a header message."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{text}{Colors.ENDC}")
+    _emit(f"\n{Colors.HEADER}{Colors.BOLD}{text}{Colors.ENDC}")
 
 
 def print_success(text: str) -> None:
     """Print a success message."""
-    print(f"{Colors.OKGREEN}✓ {text}{Colors.ENDC}")
+    _emit(f"{Colors.OKGREEN}✓ {text}{Colors.ENDC}")
 
 
 def print_warning(text: str) -> None:
     """Print a warning message."""
-    print(f"{Colors.WARNING}⚠ {text}{Colors.ENDC}")
+    _emit(f"{Colors.WARNING}⚠ {text}{Colors.ENDC}")
 
 
 def print_error(text: str) -> None:
     """Print an error message."""
-    print(f"{Colors.FAIL}✗ {text}{Colors.ENDC}")
+    _emit(f"{Colors.FAIL}✗ {text}{Colors.ENDC}")
 
 
 def print_info(text: str) -> None:
     """Print an info message."""
-    print(f"{Colors.OKCYAN}ℹ {text}{Colors.ENDC}")
+    _emit(f"{Colors.OKCYAN}ℹ {text}{Colors.ENDC}")
 
 
 # Directorios y archivos a ignorar
@@ -69,10 +104,16 @@ IGNORED_PATTERNS: Set[str] = {
     '*.save',
 }
 
+# Extensiones y nombres de componentes ignorados, separados una sola vez
+_IGNORED_EXTS = frozenset(p[1:] for p in IGNORED_PATTERNS if p.startswith('*.'))
+_IGNORED_COMPONENTS = frozenset(p for p in IGNORED_PATTERNS if not p.startswith('*.'))
+
 # Archivos específicos a ignorar
-IGNORED_FILES: Set[str] = {
-    'scripts/seed_prod_direct.py',
-}
+IGNORED_FILES: FrozenSet[str] = frozenset(
+    path.replace('\\', '/') for path in (
+        'scripts/seed_prod_direct.py',
+    )
+)
 
 # Archivos que requieren sanitización
 FILES_TO_SANITIZE: Set[str] = {
@@ -80,165 +121,244 @@ FILES_TO_SANITIZE: Set[str] = {
     'bot/services/analytics_service.py',
 }
 
+# Saltos de línea y líneas en blanco, para ubicar bloques por offset
+_NEWLINE_RE = re.compile('\n')
+_BLANK_LINES_RE = re.compile(r'(?:[ \t\f\r]*\n)*(?:[ \t\f\r]*\Z)?')
+
+# Sangría de líneas con contenido / de cualquier línea (grupo 1: primer carácter visible)
+_INDENT_RE = re.compile(r'^[ \t]*(?=\S)', re.M)
+_LEADING_WS_RE = re.compile(r'^[ \t]*(?=(\S)?)', re.M)
+
 
-def should_ignore(path: Path, root: Path) -> bool:
-    """Check if a path should be ignored."""
-    rel_path = path.relative_to(root)
-    rel_str = str(rel_path)
+def should_ignore(name: str, rel_path: str) -> bool:
+    """Check if an entry should be ignored, given its name and '/'-separated relative path.
     
-    # Check specific files
-    if rel_str in IGNORED_FILES:
+    Only the entry's own name is checked against the ignored components: the
+    walker never descends into ignored directories, so no ancestor can match.
+    """
+    if os.path.splitext(name)[1] in _IGNORED_EXTS:
+        return True
+    if name in _IGNORED_COMPONENTS:
         return True
+    return rel_path in IGNORED_FILES
+
+
+def _walk_scandir(path: str, rel_root: str = '') -> Iterator[Tuple[os.DirEntry, str]]:
+    """Yield (entry, rel_path) for every file and directory below path.
     
-    # Check patterns
-    for pattern in IGNORED_PATTERNS:
-        if pattern.startswith('*.'):
-            # File extension pattern
-            if path.name.endswith(pattern[1:]):
-                return True
-        elif pattern in path.parts:
-            # Directory or file name pattern
-            return True
+    rel_path is built incrementally with '/' separators. Directories are
+    yielded before their contents; a directory whose name is an ignored
+    component is yielded (so callers can count it) but not descended into.
+    Uses the d_type cached by os.scandir, so no extra stat is made per entry.
+    """
+    with os.scandir(path) as it:
+        entries = list(it)
+    
+    for entry in entries:
+        rel_path = f'{rel_root}/{entry.name}' if rel_root else entry.name
+        if entry.is_dir():
+            # Like os.walk, symlinked directories are neither followed nor
+            # copied; ignored ones are listed but their subtree is never scanned.
+            if entry.is_symlink():
+                continue
+            yield entry, rel_path
+            if entry.name not in _IGNORED_COMPONENTS:
+                yield from _walk_scandir(entry.path, rel_path)
+        else:
+            yield entry, rel_path
+
+
+# Hilos para la fase de copia (limitada por I/O, no por CPU)
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Errores con los que copy_file_range/sendfile no aplican y se usa el siguiente método
+_COPY_FALLBACK_ERRNOS = frozenset({errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP})
+
+
+def _fast_copy(src_fd: int, dst_fd: int, size: int) -> None:
+    """Copy size bytes from src_fd to dst_fd, inside the kernel when possible.
     
-    return False
+    Tries os.copy_file_range, then os.sendfile, then a userspace copy. Each
+    step continues from the current file offsets, so a fallback after a
+    partial copy does not duplicate data.
+    """
+    remaining = size
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src_fd, dst_fd, remaining)
+                if not copied:
+                    break
+                remaining -= copied
+            return
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+    
+    if hasattr(os, 'sendfile'):
+        try:
+            while remaining > 0:
+                sent = os.sendfile(dst_fd, src_fd, None, remaining)
+                if not sent:
+                    break
+                remaining -= sent
+            return
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+    
+    with open(src_fd, 'rb', closefd=False) as fsrc, open(dst_fd, 'wb', closefd=False) as fdst:
+        shutil.copyfileobj(fsrc, fdst)
 
 
-def replace_function_block(content: str, function_name: str, new_code: str) -> str:
-    """Replace a complete function block with new code.
+def _copy_file(src: str, dst: str, st: os.stat_result) -> None:
+    """Copy contents, permission bits and timestamps of a file, like shutil.copy2."""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        _fast_copy(fsrc.fileno(), fdst.fileno(), st.st_size)
+    os.chmod(dst, st.st_mode & 0o7777)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _fast_rmtree(path: str) -> None:
+    """Delete a directory tree, unlinking its files in parallel.
+    
+    Symlinks are removed, never followed. On non-POSIX systems, for a
+    symlinked root, or if any step fails, shutil.rmtree does (or finishes)
+    the job.
+    """
+    if os.name != 'posix' or os.path.islink(path):
+        shutil.rmtree(path)
+        return
+    
+    try:
+        files = []
+        dirs = [path]
+        pending = [path]
+        while pending:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                        pending.append(entry.path)
+                    else:
+                        files.append(entry.path)
+        
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+            # list() re-raises the first unlink error, if any
+            list(executor.map(os.unlink, files))
+        
+        # Every directory was listed after its parent, so reversed order
+        # removes children first
+        for directory in reversed(dirs):
+            os.rmdir(directory)
+    except OSError:
+        shutil.rmtree(path)
+
+
+@lru_cache(maxsize=None)
+def _def_pattern(function_names: Tuple[str, ...]) -> 're.Pattern[str]':
+    """Compile (once per set of names) a 'def <name>(' alternation capturing the name."""
+    alternation = '|'.join(re.escape(name) for name in function_names)
+    return re.compile(rf'def ({alternation})\s*\(')
+
+
+def _reindent(new_code: str, base_indent: int) -> str:
+    """Shift a template so its first non-empty line starts at base_indent."""
+    first_indent = _INDENT_RE.search(new_code)
+    if first_indent is None:
+        return new_code
+    
+    indent_diff = base_indent - len(first_indent.group())
+    if indent_diff == 0:
+        return new_code
+    
+    # Adjust all lines by the difference, preserving relative indentation;
+    # whitespace-only lines become empty
+    return _LEADING_WS_RE.sub(
+        lambda m: ' ' * (len(m.group()) + indent_diff) if m.group(1) else '',
+        new_code,
+    )
+
+
+def replace_function_blocks(content: str, replacements: Dict[str, str]) -> str:
+    """Replace several complete function blocks with new code in one pass.
     
-    Finds the function from 'def function_name(...):' until the next function/class or end of file.
-    Uses indentation to determine function boundaries.
+    Locates the functions with the ``ast`` module, so multiline signatures,
+    decorators, nested blocks and strings containing 'def' are handled by the
+    parser itself. Each block runs from the 'def' line to the last line of the
+    body, plus the blank lines that follow it. The content is parsed and
+    walked once for all functions.
     
     Args:
         content: Original file content
-        function_name: Name of the function to replace (e.g., '_build_image_prompt')
-        new_code: Complete replacement code (must be valid Python)
+        replacements: Function name -> complete replacement code (valid Python)
     
     Returns:
-        Content with function replaced
+        Content with the functions replaced
     """
-    # Find the start of the function definition
-    # Search for "def function_name(" - this handles both single-line and multiline definitions
-    func_start_pattern = rf'def {re.escape(function_name)}\s*\('
-    match = re.search(func_start_pattern, content)
-    
-    if not match:
-        print_warning(f"Function {function_name} not found in content")
+    # Cheap textual check first, one scan for all names: skip parsing for
+    # defs that are not there at all
+    pattern = _def_pattern(tuple(sorted(replacements)))
+    present = {match.group(1) for match in pattern.finditer(content)}
+    wanted = {}
+    for function_name, new_code in replacements.items():
+        if function_name in present:
+            wanted[function_name] = new_code
+        else:
+            print_warning(f"Function {function_name} not found in content")
+    if not wanted:
         return content
     
-    start_pos = match.start()
-    
-    # Find the end of the function definition (the colon after the closing paren)
-    # Handle multiline function definitions by counting parentheses
-    remaining = content[start_pos:]
-    paren_count = 0
-    found_colon = False
-    def_end_pos = 0
-    
-    for i, char in enumerate(remaining):
-        if char == '(':
-            paren_count += 1
-        elif char == ')':
-            paren_count -= 1
-            if paren_count == 0:
-                # Found matching closing paren, now look for colon (may have type hints -> str:)
-                j = i + 1
-                while j < len(remaining):
-                    if remaining[j] == ':':
-                        found_colon = True
-                        def_end_pos = start_pos + j + 1
-                        break
-                    elif remaining[j] not in ' \t\n->':
-                        # Unexpected character, break
-                        break
-                    j += 1
-                if found_colon:
-                    break
-    
-    if not found_colon:
-        print_warning(f"Could not find complete function definition for {function_name}")
+    try:
+        tree = ast.parse(content)
+    except SyntaxError as e:
+        print_warning(f"Could not parse content to find {', '.join(wanted)}: {e}")
         return content
     
-    # Now find where the function body ends by looking at indentation
-    # Get the indentation level of the function definition
-    func_def_start_line = content[:start_pos].rfind('\n') + 1
-    func_def_line = content[func_def_start_line:def_end_pos]
-    func_indent = len(func_def_line) - len(func_def_line.lstrip())
-    
-    # Find the next line that starts a new function/class at same or less indentation
-    lines_after_def = content[def_end_pos:].split('\n')
-    end_pos = def_end_pos
-    found_end = False
-    
-    for i, line in enumerate(lines_after_def):
-        stripped = line.lstrip()
-        if not stripped:  # Empty line, continue
-            end_pos += len(line) + 1  # +1 for newline
-            continue
-        
-        line_indent = len(line) - len(stripped)
-        
-        # Check if this line starts a new function or class at same or less indentation
-        if (line_indent <= func_indent and 
-            (stripped.startswith('def ') or stripped.startswith('class '))):
-            found_end = True
-            break
-        
-        end_pos += len(line) + 1  # +1 for newline
-    
-    if not found_end:
-        # Function goes to end of file
-        end_pos = len(content)
-    
-    # Get the indentation of the function definition line in the original
-    # Find the start of the line containing the function definition
-    func_def_line_start = content[:start_pos].rfind('\n') + 1
-    if func_def_line_start > 0:
-        # Get the part of the line before "def function_name"
-        line_prefix = content[func_def_line_start:start_pos]
-        original_base_indent = len(line_prefix) - len(line_prefix.lstrip())
-    else:
-        original_base_indent = 0
-    
-    # Get the indentation of the first line in the template
-    new_code_lines = new_code.split('\n')
-    if new_code_lines:
-        first_non_empty = next((line for line in new_code_lines if line.strip()), None)
-        if first_non_empty:
-            template_base_indent = len(first_non_empty) - len(first_non_empty.lstrip())
-            # Calculate the difference
-            indent_diff = original_base_indent - template_base_indent
-            
-            if indent_diff != 0:
-                # Adjust all lines by the difference, preserving relative indentation
-                adjusted_lines = []
-                for line in new_code_lines:
-                    if line.strip():
-                        # Preserve the original indent and add the difference
-                        current_indent = len(line) - len(line.lstrip())
-                        adjusted_lines.append(' ' * (current_indent + indent_diff) + line.lstrip())
-                    else:
-                        adjusted_lines.append('')
-                new_code = '\n'.join(adjusted_lines)
-    
-    # Replace the function block
-    # Use func_def_line_start instead of start_pos to include the indentation
-    # But we need to find where the function definition line actually starts
-    func_def_line_start = content[:start_pos].rfind('\n') + 1
-    before = content[:func_def_line_start]
-    after = content[end_pos:]
+    nodes = {}
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and node.name in wanted
+            and node.name not in nodes
+        ):
+            nodes[node.name] = node
     
-    print_success(f"Replaced function {function_name}")
+    for function_name in wanted.keys() - nodes.keys():
+        print_warning(f"Function {function_name} not found in content")
     
-    return before + new_code + after
+    # Offset where each line starts, counting only '\n' as ast does
+    # (str.splitlines would also split on '\x0c', '\u2028', ...)
+    line_starts = [0]
+    line_starts.extend(m.end() for m in _NEWLINE_RE.finditer(content))
+    line_starts.append(len(content))
+    
+    edits = []
+    for function_name, node in nodes.items():
+        start = line_starts[node.lineno - 1]
+        # Blank lines after the body belong to the replaced block
+        end = _BLANK_LINES_RE.match(content, line_starts[node.end_lineno]).end()
+        # The def column is the indentation of the original function
+        edits.append((start, end, _reindent(wanted[function_name], node.col_offset)))
+    
+    # Build the output in one sweep and join once
+    parts = []
+    pos = 0
+    for start, end, new_code in sorted(edits):
+        parts.append(content[pos:start])
+        parts.append(new_code)
+        pos = end
+    parts.append(content[pos:])
+    return ''.join(parts)
 
 
-def sanitize_ai_service(content: str) -> str:
-    """Sanitize prompts in ai_service.py by replacing entire function blocks."""
-    print_info("Sanitizing ai_service.py...")
-    
-    # Template for _build_image_prompt
-    image_prompt_template = '''    def _build_image_prompt(
+def replace_function_block(content: str, function_name: str, new_code: str) -> str:
+    """Replace a complete function block with new code (see replace_function_blocks)."""
+    return replace_function_blocks(content, {function_name: new_code})
+
+
+# Plantilla para _build_image_prompt
+_IMAGE_PROMPT_TEMPLATE = '''    def _build_image_prompt(
         self,
         expense_categories: List[Dict],
         income_categories: List[Dict],
@@ -257,9 +377,10 @@ def sanitize_ai_service(content: str) -> str:
         return prompt
 
 '''
-    
-    # Template for _build_audio_prompt
-    audio_prompt_template = '''    def _build_audio_prompt(
+
+
+# Plantilla para _build_audio_prompt
+_AUDIO_PROMPT_TEMPLATE = '''    def _build_audio_prompt(
         self,
         expense_categories: List[Dict],
         income_categories: List[Dict],
@@ -279,9 +400,10 @@ def sanitize_ai_service(content: str) -> str:
         return prompt
 
 '''
-    
-    # Template for _build_prompt
-    text_prompt_template = '''    def _build_prompt(
+
+
+# Plantilla para _build_prompt
+_TEXT_PROMPT_TEMPLATE = '''    def _build_prompt(
         self, 
         text: str, 
         expense_categories: List[Dict], 
@@ -302,21 +424,10 @@ def sanitize_ai_service(content: str) -> str:
         return prompt
 
 '''
-    
-    # Replace each function
-    content = replace_function_block(content, '_build_image_prompt', image_prompt_template)
-    content = replace_function_block(content, '_build_audio_prompt', audio_prompt_template)
-    content = replace_function_block(content, '_build_prompt', text_prompt_template)
-    
-    return content
 
 
-def sanitize_analytics_service(content: str) -> str:
-    """Sanitize prompts in analytics_service.py by replacing entire function blocks."""
-    print_info("Sanitizing analytics_service.py...")
-    
-    # Template for _generate_sql
-    generate_sql_template = '''    def _generate_sql(self, question: str, user_id: int) -> str:
+# Plantilla para _generate_sql
+_GENERATE_SQL_TEMPLATE = '''    def _generate_sql(self, question: str, user_id: int) -> str:
         """Generate a SQL query from a natural language question.
         
         Args:
@@ -347,20 +458,33 @@ def sanitize_analytics_service(content: str) -> str:
         ESQUEMA DE BASE DE DATOS:
         
         Tabla: transactions
-        - id (Integer, PK)
+        - id (BigInteger, PK)
         - user_id (BigInteger, FK -> users.telegram_id)
-        - category_id (Integer, FK -> categories.id)
-        - amount (Numeric(10, 2)) - Monto en COP
-        - transaction_date (DateTime) - Fecha y hora en UTC
+        - category_id (BigInteger, FK -> categories.id)
+        - amount (BigInteger) - Monto en centavos de COP (dividir entre 100 para obtener pesos)
+        - transaction_date (TIMESTAMPTZ) - Fecha y hora con zona horaria, registrada en UTC
         - description (String, nullable)
+        - category_type (String: 'income' o 'expense') - Copia de categories.type; filtrar por ella evita el JOIN
         
         Tabla: categories
-        - id (Integer, PK)
+        - id (BigInteger, PK)
         - user_id (BigInteger, FK -> users.telegram_id)
-        - name (String)
-        - type (Enum: 'INCOME' o 'EXPENSE' en MAYÚSCULAS)
+        - name (CITEXT) - Comparación sin distinguir mayúsculas
+        - type (String: 'income' o 'expense' en minúsculas)
         - is_default (Boolean)
         
+        Vista: mv_user_category_month (totales mensuales precalculados; preferirla para meses cerrados)
+        - user_id (BigInteger)
+        - category_id (BigInteger)
+        - year_month (Date) - Primer día del mes en UTC
+        - total_minor (BigInteger) - Total del mes en centavos de COP
+        - tx_count (BigInteger) - Número de transacciones del mes
+        
+        Vista: v_budget_status (presupuestos frente al gasto del mes actual en UTC)
+        - budget_id (BigInteger), user_id (BigInteger), category_id (BigInteger), category_name (CITEXT)
+        - amount, spent, remaining (BigInteger) - Centavos de COP
+        - pct_used (Numeric) - Porcentaje usado, NULL si el presupuesto es 0
+        
         REGLA CRÍTICA DE TIMEZONE:
         - Convertir transaction_date a America/Bogota antes de filtrar por fecha
         """
@@ -398,14 +522,9 @@ SQL:"""
             sql_query = response.text.strip()
             
             # Clean up SQL if wrapped in markdown code blocks
-            if "```sql" in sql_query.lower():
-                sql_start = sql_query.lower().find("```sql") + 6
-                sql_end = sql_query.lower().find("```", sql_start)
-                sql_query = sql_query[sql_start:sql_end].strip()
-            elif "```" in sql_query:
-                sql_start = sql_query.find("```") + 3
-                sql_end = sql_query.find("```", sql_start)
-                sql_query = sql_query[sql_start:sql_end].strip()
+            fence = _FENCE_RE.search(sql_query)
+            if fence:
+                sql_query = fence.group(1).strip()
             
             # Remove trailing semicolons
             sql_query = sql_query.rstrip(";").strip()
@@ -418,9 +537,10 @@ SQL:"""
             logger.error("Error generating SQL: %s", e, exc_info=True)
             raise RuntimeError(f"Error generando consulta SQL: {e}") from e
 '''
-    
-    # Template for _interpret_results
-    interpret_results_template = '''    def _interpret_results(
+
+
+# Plantilla para _interpret_results
+_INTERPRET_RESULTS_TEMPLATE = '''    def _interpret_results(
         self, 
         question: str, 
         query_results: List[Dict[str, Any]]
@@ -499,64 +619,110 @@ Responde ahora:"""
             except Exception:
                 return "Obtuve resultados pero no pude interpretarlos. Intenta reformular tu pregunta."
 '''
+
+
+def sanitize_ai_service(content: str) -> str:
+    """Sanitize prompts in ai_service.py by replacing entire function blocks."""
+    if VERBOSE:
+        print_info("Sanitizing ai_service.py...")
     
-    # Replace each function
-    content = replace_function_block(content, '_generate_sql', generate_sql_template)
-    content = replace_function_block(content, '_interpret_results', interpret_results_template)
+    return replace_function_blocks(content, {
+        '_build_image_prompt': _IMAGE_PROMPT_TEMPLATE,
+        '_build_audio_prompt': _AUDIO_PROMPT_TEMPLATE,
+        '_build_prompt': _TEXT_PROMPT_TEMPLATE,
+    })
+
+
+def sanitize_analytics_service(content: str) -> str:
+    """Sanitize prompts in analytics_service.py by replacing entire function blocks."""
+    if VERBOSE:
+        print_info("Sanitizing analytics_service.py...")
     
-    return content
+    return replace_function_blocks(content, {
+        '_generate_sql': _GENERATE_SQL_TEMPLATE,
+        '_interpret_results': _INTERPRET_RESULTS_TEMPLATE,
+    })
+
 
+def _write_all(fd: int, data: bytes) -> None:
+    """Write every byte to fd; os.write may write fewer bytes than asked."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
 
-def sanitize_file(file_path: Path, project_root: Path) -> None:
+
+def _write_text(path: Path, content: str) -> None:
+    """Write content as UTF-8: one encode, then raw os.write on the descriptor."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        _write_all(fd, content.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+def _atomic_write_text(path: Path, content: str) -> None:
+    """Write content through a temp file in the same directory, then os.replace it."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        try:
+            _write_all(fd, content.encode('utf-8'))
+        finally:
+            os.close(fd)
+        # mkstemp creates the file as 0600
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def sanitize_file(file_path: Path, rel_str: str) -> None:
     """Sanitize a specific file by replacing sensitive prompts.
     
     Args:
         file_path: Absolute path to the file to sanitize
-        project_root: Absolute path to the project root (for relative path calculation)
+        rel_str: Its path relative to the project root, as listed in FILES_TO_SANITIZE
     """
-    # Calculate relative path from project root using pathlib for cross-platform compatibility
-    try:
-        rel_path = file_path.relative_to(project_root)
-        rel_str = str(rel_path).replace('\\', '/')  # Normalize path separators
-    except ValueError:
-        # If file_path is not relative to project_root, try to find it in FILES_TO_SANITIZE
-        rel_str = None
-        for sanitize_path in FILES_TO_SANITIZE:
-            if file_path.name in sanitize_path or str(file_path).endswith(sanitize_path.replace('/', os.sep)):
-                rel_str = sanitize_path
-                break
-        
-        if rel_str is None:
-            return
-    
-    if rel_str not in FILES_TO_SANITIZE:
-        return
-    
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        if 'bot/services/ai_service.py' in rel_str:
+        if rel_str == 'bot/services/ai_service.py':
             content = sanitize_ai_service(content)
-        elif 'bot/services/analytics_service.py' in rel_str:
+        elif rel_str == 'bot/services/analytics_service.py':
             content = sanitize_analytics_service(content)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        _atomic_write_text(file_path, content)
         
         print_success(f"Sanitized {rel_str}")
     except Exception as e:
         print_error(f"Error sanitizing {rel_str}: {e}")
+    finally:
+        flush_output()
 
 
-def copy_project(src: Path, dst: Path) -> None:
-    """Copy project files to destination, filtering ignored files."""
+def copy_project(
+    src: Path,
+    dst: Path,
+    generated_files: Optional[Dict[str, Callable[[Path], None]]] = None,
+) -> None:
+    """Copy project files to destination, filtering ignored files.
+    
+    Args:
+        src: Project root to copy
+        dst: Destination root
+        generated_files: Relative path -> function that writes that file under
+            dst. They run in the copy pool once the directories exist, and the
+            source files at those paths are not copied.
+    """
+    generated_files = generated_files or {}
     if dst.exists():
+        flush_output()
         response = input(f"\n{Colors.WARNING}Destination {dst} already exists. Delete and recreate? (y/N): {Colors.ENDC}")
         if response.lower() != 'y':
             print_error("Operation cancelled.")
             sys.exit(1)
-        shutil.rmtree(dst)
+        _fast_rmtree(str(dst))
         print_success(f"Removed existing {dst}")
     
     dst.mkdir(parents=True, exist_ok=True)
@@ -566,48 +732,72 @@ def copy_project(src: Path, dst: Path) -> None:
     
     print_header(f"Copying files from {src} to {dst}...")
     
-    for root, dirs, files in os.walk(src):
-        root_path = Path(root)
-        rel_root = root_path.relative_to(src)
-        dst_root = dst / rel_root
-        
-        # Filter directories to ignore
-        dirs[:] = [d for d in dirs if not should_ignore(root_path / d, src)]
-        
-        # Create destination directory if needed
-        if not should_ignore(root_path, src):
-            dst_root.mkdir(parents=True, exist_ok=True)
-        
-        # Copy files
-        for file in files:
-            file_path = root_path / file
-            if should_ignore(file_path, src):
-                ignored_files += 1
-                continue
-            
-            dst_file = dst_root / file
+    # Enumerate first: directories are created here, file copies go to the pool
+    dst_dirs = []
+    copy_jobs = []
+    dst_str = str(dst)
+    for entry, rel_path in _walk_scandir(str(src)):
+        dst_path = os.path.join(dst_str, rel_path)
+        if should_ignore(entry.name, rel_path):
+            ignored_files += 1
+        elif entry.is_dir():
+            dst_dirs.append(dst_path)
+        elif rel_path not in generated_files:
+            copy_jobs.append((entry.path, dst_path, entry.stat()))
+    
+    # Parents are listed before their children, so a known parent means a
+    # single mkdir instead of makedirs' exists() check on every ancestor
+    created_dirs = {dst_str}
+    for dst_dir in dst_dirs:
+        if dst_dir in created_dirs:
+            continue
+        parent = os.path.dirname(dst_dir)
+        if parent in created_dirs:
+            os.mkdir(dst_dir)
+            created_dirs.add(dst_dir)
+            continue
+        os.makedirs(dst_dir, exist_ok=True)
+        # makedirs created every missing parent as well
+        path = dst_dir
+        while path not in created_dirs:
+            created_dirs.add(path)
+            path = os.path.dirname(path)
+    
+    # Copying is I/O bound, so threads overlap the syscalls of different files
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        generator_futures = [executor.submit(create, dst) for create in generated_files.values()]
+        futures = {
+            executor.submit(_copy_file, src_path, dst_path, st): src_path
+            for src_path, dst_path, st in copy_jobs
+        }
+        for future in as_completed(futures):
             try:
-                shutil.copy2(file_path, dst_file)
+                future.result()
                 copied_files += 1
             except Exception as e:
-                print_error(f"Error copying {file_path}: {e}")
+                print_error(f"Error copying {futures[future]}: {e}")
+        # Generated files are required: their errors propagate to the caller
+        for future in generator_futures:
+            future.result()
     
     print_success(f"Copied {copied_files} files")
     print_info(f"Ignored {ignored_files} files/directories")
+    flush_output()
     
     # Sanitize files in destination
     print_header("Sanitizing sensitive files...")
-    for rel_path in FILES_TO_SANITIZE:
-        file_path = dst / rel_path
+    sanitize_targets = [(dst / rel_str, rel_str) for rel_str in FILES_TO_SANITIZE]
+    for file_path, rel_str in sanitize_targets:
         if file_path.exists():
-            sanitize_file(file_path, dst)
+            sanitize_file(file_path, rel_str)
         else:
-            print_warning(f"File not found: {rel_path}")
+            print_warning(f"File not found: {rel_str}")
 
 
 def create_env_example(dst: Path) -> None:
     """Create .env.example file with placeholders."""
-    print_header("Creating .env.example...")
+    if VERBOSE:
+        print_header("Creating .env.example...")
     
     env_example = """# Telegram Bot Configuration
 TELEGRAM_TOKEN=your_telegram_token_here
@@ -635,15 +825,15 @@ GEMINI_API_KEY=your_gemini_api_key_here
 """
     
     env_file = dst / '.env.example'
-    with open(env_file, 'w', encoding='utf-8') as f:
-        f.write(env_example)
+    _write_text(env_file, env_example)
     
     print_success("Created .env.example")
 
 
 def create_readme_note(dst: Path) -> None:
     """Create a note about sanitization in the public repo."""
-    print_header("Creating sanitization note...")
+    if VERBOSE:
+        print_header("Creating sanitization note...")
     
     note = """# ⚠️ Public Repository Notice
 
@@ -677,8 +867,7 @@ The actual production prompts and business logic are kept in a private repositor
 """
     
     note_file = dst / 'PUBLIC_REPO_NOTICE.md'
-    with open(note_file, 'w', encoding='utf-8') as f:
-        f.write(note)
+    _write_text(note_file, note)
     
     print_success("Created PUBLIC_REPO_NOTICE.md")
 
@@ -698,14 +887,12 @@ def main():
     print_info(f"Destination: {dest_root}")
     
     try:
-        # Copy project
-        copy_project(project_root, dest_root)
-        
-        # Create .env.example
-        create_env_example(dest_root)
-        
-        # Create notice file
-        create_readme_note(dest_root)
+        # Copy project; .env.example and the notice file are written
+        # concurrently with the copies
+        copy_project(project_root, dest_root, {
+            '.env.example': create_env_example,
+            'PUBLIC_REPO_NOTICE.md': create_readme_note,
+        })
         
         print_header("=" * 60)
         print_success("Public repository prepared successfully!")
@@ -719,12 +906,16 @@ def main():
         
     except KeyboardInterrupt:
         print_error("\nOperation cancelled by user.")
+        flush_output()
         sys.exit(1)
     except Exception as e:
         print_error(f"Error: {e}")
+        flush_output()
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        flush_output()
 
 
 if __name__ == '__main__':
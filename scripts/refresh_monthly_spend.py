@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Refresca la vista materializada mv_user_category_month.
+
+Pensado para ejecutarse desde un cron del sistema (Railway cron, crontab)
+cuando la base de datos no tiene la extensión pg_cron:
+
+    */5 * * * * python scripts/refresh_monthly_spend.py
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import engine  # noqa: E402
+
+
+def main() -> None:
+    """Refresca la vista sin bloquear las lecturas concurrentes."""
+    with engine.begin() as connection:
+        connection.execute(
+            text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_user_category_month")
+        )
+
+
+if __name__ == '__main__':
+    main()
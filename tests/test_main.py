@@ -1,137 +1,258 @@
 from datetime import datetime, timezone
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
+from operator import attrgetter
 from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from pytest_mock import MockerFixture
-from telegram import InlineKeyboardMarkup
 
-import main
+from bot.handlers import categories, transactions
+from bot.utils import time_utils
+from bot.utils.callback_manager import CallbackManager
 from models import Category, CategoryType, Transaction
 
+# Montos de prueba, parseados una sola vez al cargar el módulo
+AMT_100 = Decimal("100.00")
+AMT_123_45 = Decimal("123.45")
+AMT_500 = Decimal("500.00")
+AMT_1234_50 = Decimal("1234.50")
+AMT_1500 = Decimal("1500.00")
+AMT_1500_50 = Decimal("1500.50")
+AMT_5000 = Decimal("5000.00")
+AMT_25000 = Decimal("25000.00")
+AMT_40000 = Decimal("40000.00")
 
-def _mock_session_factory(mocker: MockerFixture, session) -> None:
-    context_manager = mocker.MagicMock()
+# Instante fijo que devuelve get_now_utc() durante los tests
+FIXED_NOW = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+class FrozenDatetime(datetime):
+    """datetime cuyo now() siempre es FIXED_NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return FIXED_NOW.astimezone(tz) if tz is not None else FIXED_NOW.replace(tzinfo=None)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _freeze_now():
+    """Congela el reloj para todo el módulo (resultados deterministas).
+
+    Los handlers leen la hora con get_now_utc(), que llama a datetime.now()
+    de bot.utils.time_utils; se reemplaza ese nombre.
+    """
+    with pytest.MonkeyPatch.context() as patcher:
+        patcher.setattr(time_utils, "datetime", FrozenDatetime)
+        yield
+
+
+@pytest.fixture(scope="module")
+def session_factory():
+    """Inyecta una fábrica de sesiones en los handlers una vez por módulo y entrega la sesión mock.
+
+    Cada módulo de handlers importa SessionLocal de database; la fábrica se
+    asigna como atributo plano de esos módulos (sin mock.patch) y se restaura
+    al terminar el módulo.
+    """
+    session = MagicMock()
+    context_manager = MagicMock()
     context_manager.__enter__.return_value = session
     context_manager.__exit__.return_value = None
-    mocker.patch("main.SessionLocal", return_value=context_manager)
+    with pytest.MonkeyPatch.context() as patcher:
+        for module in (transactions, categories):
+            patcher.setattr(module, "SessionLocal", lambda: context_manager)
+        yield session
+
+
+@pytest.fixture
+def session(session_factory: MagicMock) -> MagicMock:
+    """Sesión mock compartida, reiniciada antes de cada test."""
+    session_factory.reset_mock(return_value=True, side_effect=True)
+    return session_factory
+
+
+# Categorías de prueba: sin sesión son simples contenedores y ningún test las
+# modifica, así que se construyen una vez por módulo.
+@pytest.fixture(scope="module")
+def cat_comida() -> Category:
+    return Category(id=5, user_id=123, name="Comida", type=CategoryType.EXPENSE, is_default=False)
+
+
+@pytest.fixture(scope="module")
+def cat_salario() -> Category:
+    return Category(id=7, user_id=123, name="Salario", type=CategoryType.INCOME, is_default=False)
+
+
+@pytest.fixture(scope="module")
+def cat_general_default() -> Category:
+    return Category(id=99, user_id=123, name="General", type=CategoryType.EXPENSE, is_default=True)
+
+
+class AwaitRecorder:
+    """Doble awaitable liviano que registra sus llamadas (sustituye a AsyncMock)."""
+
+    __slots__ = ("calls",)
+
+    def __init__(self) -> None:
+        self.calls: list = []
+
+    async def __call__(self, *args, **kwargs) -> None:
+        self.calls.append((args, kwargs))
+
+    @property
+    def await_args(self) -> SimpleNamespace:
+        args, kwargs = self.calls[-1]
+        return SimpleNamespace(args=args, kwargs=kwargs)
+
+    def assert_awaited(self) -> None:
+        assert self.calls, "No fue awaited"
+
+    def assert_awaited_once(self) -> None:
+        assert len(self.calls) == 1, f"Awaited {len(self.calls)} veces"
+
+    def assert_awaited_once_with(self, *args, **kwargs) -> None:
+        assert self.calls == [(args, kwargs)], f"Llamadas: {self.calls}"
 
+    def assert_awaited_once_starting_with(self, prefix: str) -> None:
+        """Una sola llamada cuyo texto (primer argumento) empieza por prefix."""
+        self.assert_awaited_once()
+        args, _ = self.calls[0]
+        assert args[0].startswith(prefix), f"Texto: {args[0]!r}"
 
-def _build_update_with_message(mocker: MockerFixture, user_id: int = 123):
-    message = SimpleNamespace(reply_text=mocker.AsyncMock())
+
+class ExecuteResult:
+    """Resultado fijo de session.execute, sin el registro de llamadas de MagicMock."""
+
+    __slots__ = ("_scalar", "_scalars")
+
+    def __init__(self, scalar=None, scalars=()) -> None:
+        self._scalar = scalar
+        self._scalars = scalars
+
+    def scalar_one_or_none(self):
+        return self._scalar
+
+    def scalars(self):
+        return iter(self._scalars)
+
+
+def _build_update_with_message(user_id: int = 123):
+    message = SimpleNamespace(reply_text=AwaitRecorder())
     effective_user = SimpleNamespace(id=user_id)
     return SimpleNamespace(effective_user=effective_user, message=message)
 
 
-def _build_update_with_callback(mocker: MockerFixture, data: str, user_id: int = 123):
+def _build_update_with_callback(data: str, user_id: int = 123):
     query = SimpleNamespace(
         data=data,
-        answer=mocker.AsyncMock(),
-        edit_message_text=mocker.AsyncMock(),
+        answer=AwaitRecorder(),
+        edit_message_text=AwaitRecorder(),
         message=SimpleNamespace(chat_id=999),
     )
     effective_user = SimpleNamespace(id=user_id)
     return SimpleNamespace(effective_user=effective_user, callback_query=query)
 
 
-@pytest.mark.asyncio
-async def test_show_recent_transactions_without_results(mocker: MockerFixture) -> None:
-    session = mocker.MagicMock()
-    execute_result = mocker.MagicMock()
-    execute_result.scalar_one_or_none.return_value = None
-    session.execute.return_value = execute_result
-    _mock_session_factory(mocker, session)
+def _first_button(reply: AwaitRecorder):
+    """Primer botón del teclado enviado en la primera llamada registrada.
+
+    Lee los kwargs capturados por el recorder por duck typing, sin depender
+    del tipo InlineKeyboardMarkup.
+    """
+    _, kwargs = reply.calls[0]
+    reply_markup = kwargs["reply_markup"]
+    assert reply_markup
+    return reply_markup.inline_keyboard[0][0]
+
+
+@pytest.fixture
+def message_harness(session: MagicMock) -> SimpleNamespace:
+    """Update con mensaje, context vacío y sesión mock, ya conectados."""
+    return SimpleNamespace(
+        update=_build_update_with_message(),
+        context=SimpleNamespace(user_data={}),
+        session=session,
+    )
+
+
+@pytest.fixture
+def callback_harness(request: pytest.FixtureRequest, session: MagicMock) -> SimpleNamespace:
+    """Como message_harness, con un callback; request.param es el callback_data."""
+    return SimpleNamespace(
+        update=_build_update_with_callback(request.param),
+        context=SimpleNamespace(user_data={}),
+        session=session,
+    )
+
 
-    update = _build_update_with_message(mocker)
-    context = SimpleNamespace()
+async def test_show_recent_transactions_without_results(message_harness: SimpleNamespace) -> None:
+    message_harness.session.execute.return_value = ExecuteResult()
 
-    await main.show_recent_transactions(update, context)
+    await transactions.show_recent_transactions(message_harness.update, message_harness.context)
 
-    update.message.reply_text.assert_awaited_once_with("No encontré transacciones recientes.")
+    message_harness.update.message.reply_text.assert_awaited_once_with(
+        "No encontré transacciones recientes."
+    )
 
 
-@pytest.mark.asyncio
-async def test_show_recent_transactions_with_results(mocker: MockerFixture) -> None:
-    session = mocker.MagicMock()
+async def test_show_recent_transactions_with_results(message_harness: SimpleNamespace) -> None:
     tx = SimpleNamespace(
         id=847,
-        transaction_date=datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc),
-        amount=Decimal("5000.00"),
+        transaction_date=FIXED_NOW,
+        amount=AMT_5000,
         description="Café",
     )
-    execute_result = mocker.MagicMock()
-    execute_result.scalars.return_value = iter((tx,))
-    session.execute.return_value = execute_result
-    _mock_session_factory(mocker, session)
-
-    update = _build_update_with_message(mocker)
-    context = SimpleNamespace()
+    message_harness.session.execute.return_value = ExecuteResult(scalars=(tx,))
 
-    await main.show_recent_transactions(update, context)
+    await transactions.show_recent_transactions(message_harness.update, message_harness.context)
 
-    await_args = update.message.reply_text.await_args
-    assert await_args.kwargs["reply_markup"]
-    keyboard: InlineKeyboardMarkup = await_args.kwargs["reply_markup"]
-    button = keyboard.inline_keyboard[0][0]
-    assert button.callback_data == "del_tx_847"
+    button = _first_button(message_harness.update.message.reply_text)
+    assert button.callback_data == CallbackManager.delete_transaction(847)
     assert "Café" in button.text
 
 
-@pytest.mark.asyncio
-async def test_delete_transaction_callback_user_verified(mocker: MockerFixture) -> None:
-    session = mocker.MagicMock()
+@pytest.mark.parametrize("callback_harness", [CallbackManager.delete_transaction(847)], indirect=True)
+async def test_delete_transaction_callback_user_verified(callback_harness: SimpleNamespace) -> None:
+    session = callback_harness.session
     transaction = Transaction(
         id=847,
         user_id=123,
         category_id=1,
-        amount=Decimal("100.00"),
-        transaction_date=datetime.now(timezone.utc),
+        amount=AMT_100,
+        transaction_date=FIXED_NOW,
     )
     session.get.return_value = transaction
-    _mock_session_factory(mocker, session)
 
-    query = SimpleNamespace(
-        data="del_tx_847",
-        answer=mocker.AsyncMock(),
-        edit_message_text=mocker.AsyncMock(),
-        message=SimpleNamespace(chat_id=999),
-    )
-    update = SimpleNamespace(
-        effective_user=SimpleNamespace(id=123),
-        callback_query=query,
-    )
-    context = SimpleNamespace()
-
-    await main.delete_transaction_callback(update, context)
+    await transactions.delete_transaction_callback(callback_harness.update, callback_harness.context)
 
+    session.get.assert_called_once_with(Transaction, (847, 123))
     session.delete.assert_called_once_with(transaction)
     session.commit.assert_called_once()
-    query.edit_message_text.assert_awaited_once_with("Transacción eliminada correctamente.")
+    callback_harness.update.callback_query.edit_message_text.assert_awaited_once_starting_with(
+        "Transacción eliminada correctamente."
+    )
 
 
-@pytest.mark.asyncio
-async def test_category_add_type_selected_creates_category(mocker: MockerFixture) -> None:
-    session = mocker.MagicMock()
-    execute_result = mocker.MagicMock()
-    execute_result.scalar_one_or_none.return_value = None
-    session.execute.return_value = execute_result
-    _mock_session_factory(mocker, session)
+async def test_category_add_type_selected_creates_category(session: MagicMock) -> None:
+    session.execute.return_value = ExecuteResult()
 
     query = SimpleNamespace(
-        data=f"cat_add_type:{CategoryType.EXPENSE.value}",
-        answer=mocker.AsyncMock(),
-        edit_message_text=mocker.AsyncMock(),
+        data=CallbackManager.category_add_type(CategoryType.EXPENSE.value),
+        answer=AsyncMock(),
+        edit_message_text=AsyncMock(),
         message=SimpleNamespace(chat_id=777),
     )
     update = SimpleNamespace(
         effective_user=SimpleNamespace(id=321),
         callback_query=query,
     )
-    bot = SimpleNamespace(send_message=mocker.AsyncMock())
+    bot = SimpleNamespace(send_message=AsyncMock())
     context = SimpleNamespace(bot=bot, user_data={"category_operation": {"name": "Transporte"}})
 
-    await main.category_add_type_selected(update, context)
+    next_state = await categories.category_add_type_selected(update, context)
 
+    assert next_state == categories.CATEGORY_MENU
     session.add.assert_called_once()
     added_category: Category = session.add.call_args.args[0]
     assert added_category.user_id == 321
@@ -142,228 +263,182 @@ async def test_category_add_type_selected_creates_category(mocker: MockerFixture
     context.bot.send_message.assert_awaited_once()
 
 
-def test_parse_amount_success() -> None:
-    amount = main.parse_amount(" 1234,56 ")
-    assert amount == Decimal("1234.56")
-
+async def test_expense_amount_received_stores_pending_transaction(
+    mocker: MockerFixture, message_harness: SimpleNamespace
+) -> None:
+    send_prompt = mocker.patch.object(transactions, "_send_category_prompt", new=AsyncMock())
+    message_harness.update.message.text = "1500"
 
-def test_parse_amount_invalid() -> None:
-    with pytest.raises(InvalidOperation):
-        main.parse_amount("-50")
+    next_state = await transactions.expense_amount_received(message_harness.update, message_harness.context)
 
-
-@pytest.mark.asyncio
-async def test_expense_amount_received_stores_pending_transaction(mocker: MockerFixture) -> None:
-    send_prompt = mocker.patch("main.send_category_prompt", new=mocker.AsyncMock())
-
-    update = _build_update_with_message(mocker)
-    update.message.text = "1500"
-    context = SimpleNamespace(user_data={})
-
-    next_state = await main.expense_amount_received(update, context)
-
-    assert next_state == main.EXPENSE_CATEGORY
-    assert context.user_data["pending_transaction"]["amount"] == Decimal("1500.00")
+    assert next_state == transactions.EXPENSE_CATEGORY
+    assert message_harness.context.user_data["pending_transaction"]["amount"] == AMT_1500
     send_prompt.assert_awaited_once()
 
 
-@pytest.mark.asyncio
-async def test_expense_amount_received_invalid_input(mocker: MockerFixture) -> None:
-    update = _build_update_with_message(mocker)
-    update.message.text = "mil pesos"
-    context = SimpleNamespace(user_data={})
+async def test_expense_amount_received_invalid_input(message_harness: SimpleNamespace) -> None:
+    message_harness.update.message.text = "mil pesos"
 
-    next_state = await main.expense_amount_received(update, context)
+    next_state = await transactions.expense_amount_received(message_harness.update, message_harness.context)
 
-    assert next_state == main.EXPENSE_AMOUNT
-    update.message.reply_text.assert_awaited_once_with(
+    assert next_state == transactions.EXPENSE_AMOUNT
+    message_harness.update.message.reply_text.assert_awaited_once_with(
         "Monto no válido. Intenta nuevamente con un número positivo."
     )
 
 
-@pytest.mark.asyncio
-async def test_expense_category_selected_prompts_description(mocker: MockerFixture) -> None:
-    session = mocker.MagicMock()
-    category = Category(
-        id=5,
-        user_id=123,
-        name="Comida",
-        type=CategoryType.EXPENSE,
-        is_default=False,
-    )
-    session.get.return_value = category
-    _mock_session_factory(mocker, session)
+@pytest.mark.parametrize("callback_harness", [CallbackManager.category(5)], indirect=True)
+async def test_expense_category_selected_prompts_description(
+    callback_harness: SimpleNamespace, cat_comida: Category
+) -> None:
+    update, context, session = callback_harness.update, callback_harness.context, callback_harness.session
+    session.get.return_value = cat_comida
+    context.user_data["pending_transaction"] = {"amount": AMT_25000, "type": "expense"}
 
-    update = _build_update_with_callback(mocker, "cat:5")
-    context = SimpleNamespace(
-        user_data={"pending_transaction": {"amount": Decimal("25000.00"), "type": "expense"}}
-    )
+    next_state = await transactions.expense_category_selected(update, context)
 
-    next_state = await main.expense_category_selected(update, context)
-
-    assert next_state == main.EXPENSE_DESCRIPTION_DECISION
+    assert next_state == transactions.EXPENSE_DESCRIPTION_DECISION
     session.add.assert_not_called()
     assert context.user_data["pending_transaction"]["category_id"] == 5
     update.callback_query.edit_message_text.assert_awaited()
 
 
-@pytest.mark.asyncio
-async def test_expense_description_received_uses_default_category(mocker: MockerFixture) -> None:
-    session = mocker.MagicMock()
-    default_category = Category(
-        id=99,
-        user_id=123,
-        name="General",
-        type=CategoryType.EXPENSE,
-        is_default=True,
-    )
-    execute_result = mocker.MagicMock()
-    execute_result.scalar_one_or_none.return_value = default_category
-    session.execute.return_value = execute_result
-    _mock_session_factory(mocker, session)
-
-    update = _build_update_with_message(mocker)
-    update.message.text = "Cena de trabajo"
-    context = SimpleNamespace(
-        user_data={"pending_transaction": {"amount": Decimal("40000.00"), "type": "expense"}}
-    )
-
-    next_state = await main.expense_description_received(update, context)
-
-    assert next_state == main.ConversationHandler.END
+# Flujo de descripción de un gasto. category: fixture de la categoría que
+# devuelve la sesión y cómo se busca ("get" por id o "execute" para la
+# categoría por defecto). reply: inicio de la respuesta esperada a un mensaje
+# de texto; None si el handler edita el mensaje del callback.
+DESCRIPTION_SCENARIOS = {
+    "default_cat": SimpleNamespace(
+        handler="expense_description_received",
+        text="Cena de trabajo",
+        callback_data=None,
+        category="cat_general_default",
+        category_lookup="execute",
+        pending={"amount": AMT_40000, "type": "expense"},
+        expected_state="ConversationHandler.END",
+        added_category_id=99,
+        description="Cena de trabajo",
+        reply="Gasto registrado correctamente en la categoría General.",
+        keeps_pending=False,
+    ),
+    "selected_cat": SimpleNamespace(
+        handler="expense_description_received",
+        text="Cena rápida",
+        callback_data=None,
+        category="cat_comida",
+        category_lookup="get",
+        pending={
+            "amount": AMT_500,
+            "type": "expense",
+            "category_id": 5,
+            "category_name": "Comida",
+        },
+        expected_state="ConversationHandler.END",
+        added_category_id=5,
+        description="Cena rápida",
+        reply="Gasto registrado correctamente en la categoría Comida.",
+        keeps_pending=False,
+    ),
+    "decision_yes": SimpleNamespace(
+        handler="expense_description_decision",
+        text=None,
+        callback_data=CallbackManager.expense_desc("yes"),
+        category=None,
+        category_lookup=None,
+        pending={"amount": AMT_123_45, "category_id": 5, "category_name": "Comida"},
+        expected_state="EXPENSE_DESCRIPTION_INPUT",
+        added_category_id=None,
+        description=None,
+        reply=None,
+        keeps_pending=True,
+    ),
+    "decision_no": SimpleNamespace(
+        handler="expense_description_decision",
+        text=None,
+        callback_data=CallbackManager.expense_desc("no"),
+        category=None,
+        category_lookup=None,
+        pending={
+            "amount": AMT_123_45,
+            "category_id": 5,
+            "category_name": "Comida",
+            "type": "expense",
+        },
+        expected_state="ConversationHandler.END",
+        added_category_id=5,
+        description=None,
+        reply=None,
+        keeps_pending=False,
+    ),
+}
+
+
+@pytest.fixture
+def built_update(request: pytest.FixtureRequest, session: MagicMock):
+    """Prepara sesión, update y context para un escenario de DESCRIPTION_SCENARIOS."""
+    scenario = DESCRIPTION_SCENARIOS[request.param]
+    if scenario.category_lookup == "get":
+        session.get.return_value = request.getfixturevalue(scenario.category)
+    elif scenario.category_lookup == "execute":
+        session.execute.return_value = ExecuteResult(
+            scalar=request.getfixturevalue(scenario.category)
+        )
+
+    if scenario.callback_data is None:
+        update = _build_update_with_message()
+        update.message.text = scenario.text
+    else:
+        update = _build_update_with_callback(scenario.callback_data)
+    context = SimpleNamespace(user_data={"pending_transaction": dict(scenario.pending)})
+    return scenario, update, context
+
+
+@pytest.mark.parametrize("built_update", list(DESCRIPTION_SCENARIOS), indirect=True)
+async def test_expense_description_flow(built_update, session: MagicMock) -> None:
+    scenario, update, context = built_update
+
+    next_state = await attrgetter(scenario.handler)(transactions)(update, context)
+
+    assert next_state == attrgetter(scenario.expected_state)(transactions)
+    if scenario.added_category_id is not None:
+        session.add.assert_called_once()
+        transaction: Transaction = session.add.call_args.args[0]
+        assert transaction.category_id == scenario.added_category_id
+        if scenario.description is not None:
+            assert transaction.description == scenario.description
+    assert ("pending_transaction" in context.user_data) == scenario.keeps_pending
+    if scenario.reply is not None:
+        update.message.reply_text.assert_awaited_once_starting_with(scenario.reply)
+    else:
+        update.callback_query.edit_message_text.assert_awaited_once()
+
+
+@pytest.mark.parametrize("callback_harness", [CallbackManager.category(7)], indirect=True)
+async def test_income_category_selected_creates_transaction(
+    callback_harness: SimpleNamespace, cat_salario: Category
+) -> None:
+    update, context, session = callback_harness.update, callback_harness.context, callback_harness.session
+    session.get.return_value = cat_salario
+    context.user_data["pending_transaction"] = {"amount": AMT_1500_50, "type": "income"}
+
+    next_state = await transactions.income_category_selected(update, context)
+
+    assert next_state == transactions.ConversationHandler.END
     session.add.assert_called_once()
     transaction: Transaction = session.add.call_args.args[0]
-    assert transaction.category_id == 99
-    assert transaction.description == "Cena de trabajo"
-    assert "pending_transaction" not in context.user_data
-    update.message.reply_text.assert_awaited_once_with(
-        "Gasto registrado correctamente en la categoría General."
-    )
-
-
-@pytest.mark.asyncio
-async def test_expense_description_decision_yes_prompts_for_text(mocker: MockerFixture) -> None:
-    update = _build_update_with_callback(mocker, "expense_desc:yes")
-    context = SimpleNamespace(
-        user_data={
-            "pending_transaction": {
-                "amount": Decimal("123.45"),
-                "category_id": 5,
-                "category_name": "Comida",
-            }
-        }
-    )
-
-    next_state = await main.expense_description_decision(update, context)
-
-    assert next_state == main.EXPENSE_DESCRIPTION_INPUT
-    update.callback_query.edit_message_text.assert_awaited_once()
-    assert "pending_transaction" in context.user_data
-
-
-@pytest.mark.asyncio
-async def test_expense_description_decision_no_creates_transaction(mocker: MockerFixture) -> None:
-    session = mocker.MagicMock()
-    _mock_session_factory(mocker, session)
-
-    update = _build_update_with_callback(mocker, "expense_desc:no")
-    context = SimpleNamespace(
-        user_data={
-            "pending_transaction": {
-                "amount": Decimal("123.45"),
-                "category_id": 5,
-                "category_name": "Comida",
-                "type": "expense",
-            }
-        }
-    )
-
-    next_state = await main.expense_description_decision(update, context)
-
-    assert next_state == main.ConversationHandler.END
-    session.add.assert_called_once()
-    transaction: Transaction = session.add.call_args.args[0]
-    assert transaction.category_id == 5
-    update.callback_query.edit_message_text.assert_awaited_once()
-    assert "pending_transaction" not in context.user_data
-
-
-@pytest.mark.asyncio
-async def test_expense_description_received_with_selected_category(mocker: MockerFixture) -> None:
-    session = mocker.MagicMock()
-    category = Category(
-        id=5,
-        user_id=123,
-        name="Comida",
-        type=CategoryType.EXPENSE,
-        is_default=False,
-    )
-    session.get.return_value = category
-    _mock_session_factory(mocker, session)
-
-    update = _build_update_with_message(mocker)
-    update.message.text = "Cena rápida"
-    context = SimpleNamespace(
-        user_data={
-            "pending_transaction": {
-                "amount": Decimal("500.00"),
-                "type": "expense",
-                "category_id": 5,
-                "category_name": "Comida",
-            }
-        }
-    )
-
-    next_state = await main.expense_description_received(update, context)
-
-    assert next_state == main.ConversationHandler.END
-    session.add.assert_called_once()
-    transaction: Transaction = session.add.call_args.args[0]
-    assert transaction.category_id == 5
-    assert transaction.description == "Cena rápida"
-    update.message.reply_text.assert_awaited_once_with(
-        "Gasto registrado correctamente en la categoría Comida."
-    )
-    assert "pending_transaction" not in context.user_data
-
-
-@pytest.mark.asyncio
-async def test_income_category_selected_creates_transaction(mocker: MockerFixture) -> None:
-    session = mocker.MagicMock()
-    category = Category(
-        id=7,
-        user_id=123,
-        name="Salario",
-        type=CategoryType.INCOME,
-        is_default=False,
-    )
-    session.get.return_value = category
-    _mock_session_factory(mocker, session)
-
-    update = _build_update_with_callback(mocker, "cat:7")
-    context = SimpleNamespace(
-        user_data={"pending_transaction": {"amount": Decimal("1500.50"), "type": "income"}}
-    )
-
-    next_state = await main.income_category_selected(update, context)
-
-    assert next_state == main.ConversationHandler.END
-    session.add.assert_called_once()
-    transaction: Transaction = session.add.call_args.args[0]
-    assert transaction.amount == Decimal("1500.50")
+    assert transaction.amount == AMT_1500_50
     assert transaction.category_id == 7
     assert "pending_transaction" not in context.user_data
-    update.callback_query.edit_message_text.assert_awaited_once_with(
+    update.callback_query.edit_message_text.assert_awaited_once_starting_with(
         "Ingreso registrado correctamente en la categoría Salario."
     )
 
 
-def test_format_transaction_button_text_today(monkeypatch) -> None:
+def test_format_transaction_button_text_today() -> None:
     tx = SimpleNamespace(
-        transaction_date=datetime.now(timezone.utc),
-        amount=Decimal("1234.50"),
+        transaction_date=FIXED_NOW,
+        amount=AMT_1234_50,
         description="Pago",
     )
-    text = main.format_transaction_button_text(tx)
+    text = transactions._format_transaction_button_text(tx)
     assert text.startswith("Hoy - 1234.5")
-
@@ -0,0 +1,42 @@
+"""Tests unitarios para los modelos y sus utilidades de esquema."""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from database import Base
+from models import TRANSACTION_PARTITION_COUNT, TRANSACTION_PARTITION_NAME, Transaction
+
+
+def test_transaction_partition_name_matches_only_partitions() -> None:
+    """Verifica que el filtro de autogenerate reconoce las particiones y ninguna tabla del modelo."""
+    for remainder in range(TRANSACTION_PARTITION_COUNT):
+        assert TRANSACTION_PARTITION_NAME.fullmatch(f"transactions_p{remainder}")
+    assert not TRANSACTION_PARTITION_NAME.fullmatch("transactions_pending")
+    assert not any(TRANSACTION_PARTITION_NAME.fullmatch(name) for name in Base.metadata.tables)
+
+
+def test_transaction_bulk_update_with_composite_key() -> None:
+    """Verifica que bulk_update acepta filas con la PK completa (id, user_id)."""
+    session = MagicMock()
+    rows = [{"id": 1, "user_id": 123, "amount": Decimal("1500.50")}]
+
+    Transaction.bulk_update(session, iter(rows))
+
+    statement, params = session.execute.call_args.args
+    assert statement.entity_description["entity"] is Transaction
+    assert params == rows
+
+
+@pytest.mark.parametrize("missing", ["id", "user_id"])
+def test_transaction_bulk_update_requires_full_primary_key(missing: str) -> None:
+    """Verifica que una fila sin alguna columna de la PK se rechaza sin ejecutar nada."""
+    session = MagicMock()
+    row = {"id": 1, "user_id": 123, "amount": Decimal("1500.50")}
+    del row[missing]
+
+    with pytest.raises(ValueError, match=missing):
+        Transaction.bulk_update(session, [row])
+
+    session.execute.assert_not_called()
@@ -0,0 +1,15 @@
+from decimal import Decimal, InvalidOperation
+
+import pytest
+
+from bot.utils.amounts import parse_amount
+
+
+def test_parse_amount_success() -> None:
+    amount = parse_amount(" 1234,56 ")
+    assert amount == Decimal("1234.56")
+
+
+def test_parse_amount_invalid() -> None:
+    with pytest.raises(InvalidOperation):
+        parse_amount("-50")